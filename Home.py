@@ -2,29 +2,11 @@
 Refactored Home.py - Login and Registration using OOP
 """
 import streamlit as st
-from pathlib import Path
 
 # Import OOP services
-from services.database_manager import DatabaseManager
+from services.db_singleton import get_db
 from services.auth_manager import AuthManager
-
-# Database path
-DB_PATH = Path("DATA") / "intelligence_platform.db"
-
-# Initialize session state
-def initialize_session_state():
-    """Initialize session state variables."""
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    
-    if "username" not in st.session_state:
-        st.session_state.username = ""
-    
-    if "role" not in st.session_state:
-        st.session_state.role = ""
-    
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
+from services.session import initialize_session_state, issue_session_token
 
 # Initialize session
 initialize_session_state()
@@ -37,8 +19,14 @@ st.set_page_config(
 )
 
 # Initialize services (using OOP)
-db = DatabaseManager(str(DB_PATH))
-auth_manager = AuthManager(db)
+# Cached so every rerun reuses one manager and connection
+@st.cache_resource
+def get_auth() -> AuthManager:
+    """Create the shared AuthManager."""
+    return AuthManager(get_db())
+
+
+auth_manager = get_auth()
 
 # Page header
 st.title("🔐 Multi-Domain Intelligence Platform")
@@ -59,7 +47,8 @@ with tab_login:
             st.error("❌ Please enter both username and password")
         else:
             # Use AuthManager to login (returns User object or None)
-            user = auth_manager.login_user(login_username, login_password)
+            with st.spinner("Verifying credentials..."):
+                user = auth_manager.login_user(login_username, login_password)
             
             if user:
                 # Store user information in session state
@@ -67,14 +56,10 @@ with tab_login:
                 st.session_state.username = user.get_username()
                 st.session_state.role = user.get_role()
                 st.session_state.user_id = user.get_id()
+                issue_session_token(user.get_id())
                 
                 st.success(f"✅ Welcome back, {login_username}!")
-                
-                # Add a small delay for better UX
-                with st.spinner("Redirecting to dashboard..."):
-                    import time
-                    time.sleep(1)
-                    st.switch_page("pages/1_Dashboard.py")
+                st.switch_page("pages/1_Dashboard.py")
             else:
                 st.error("❌ Invalid username or password")
                 
@@ -105,13 +90,11 @@ with tab_register:
             st.error("❌ Passwords do not match")
         else:
             # Use AuthManager to register user (all new users are 'user' role)
-            success, message = auth_manager.register_user(new_username, new_password, "user")
+            with st.spinner("Creating account..."):
+                success, message = auth_manager.register_user(new_username, new_password, "user")
             
             if success:
                 st.success(f"✅ {message}")
                 st.info("📋 Go to Login tab to sign in")
             else:
-                st.error(f"❌ {message}")
-
-# Close database connection when done
-db.close()
\ No newline at end of file
+                st.error(f"❌ {message}")
\ No newline at end of file
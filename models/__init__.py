@@ -1,11 +1,14 @@
 from models.user import User
-from models.security_incident import SecurityIncident
-from models.dataset import Dataset
-from models.it_ticket import ITTicket
+from models.security_incident import SecurityIncident, IncidentView
+from models.dataset import Dataset, DatasetView
+from models.it_ticket import ITTicket, TicketView
 
 __all__ = [
     'User',
     'SecurityIncident',
+    'IncidentView',
     'Dataset',
-    'ITTicket'
+    'DatasetView',
+    'ITTicket',
+    'TicketView'
 ]
\ No newline at end of file
@@ -1,8 +1,34 @@
 """Dataset entity class for data science operations."""
 
+def estimate_size(rows: int, columns: int) -> str:
+    """
+    Estimate dataset size based on rows and columns.
+    
+    Args:
+        rows: Number of rows
+        columns: Number of columns
+        
+    Returns:
+        str: Human-readable size estimate
+    """
+    # Rough estimate: assume 100 bytes per cell
+    size_bytes = rows * columns * 100
+    size_mb = size_bytes / (1024 * 1024)
+    
+    if size_mb < 1:
+        return f"{size_bytes / 1024:.2f} KB"
+    elif size_mb < 1024:
+        return f"{size_mb:.2f} MB"
+    else:
+        return f"{size_mb / 1024:.2f} GB"
+
+
 class Dataset:
     """Represents a data science dataset in the platform."""
     
+    # Fixed attribute layout, no per-instance __dict__
+    __slots__ = ('__id', '__name', '__rows', '__columns', '__uploaded_by', '__upload_date')
+    
     def __init__(self, dataset_id: int, name: str, rows: int, columns: int,
                  uploaded_by: str = None, upload_date: str = None):
         """
@@ -54,16 +80,7 @@ class Dataset:
         Returns:
             str: Human-readable size estimate
         """
-        # Rough estimate: assume 100 bytes per cell
-        size_bytes = self.__rows * self.__columns * 100
-        size_mb = size_bytes / (1024 * 1024)
-        
-        if size_mb < 1:
-            return f"{size_bytes / 1024:.2f} KB"
-        elif size_mb < 1024:
-            return f"{size_mb:.2f} MB"
-        else:
-            return f"{size_mb / 1024:.2f} GB"
+        return estimate_size(self.__rows, self.__columns)
     
     def to_dict(self) -> dict:
         """Convert dataset to dictionary."""
@@ -78,4 +95,63 @@ class Dataset:
     
     def __str__(self) -> str:
         """String representation of dataset."""
-        return f"Dataset {self.__id}: {self.__name} ({self.__rows} rows, {self.__columns} cols)"
\ No newline at end of file
+        return f"Dataset {self.__id}: {self.__name} ({self.__rows} rows, {self.__columns} cols)"
+
+
+class DatasetView(tuple):
+    """
+    Read-only dataset backed by a result row.
+    
+    Returned by the dataset list queries; the getters match Dataset's.
+    The row holds (dataset_id, name, rows, columns, uploaded_by, upload_date).
+    """
+    
+    __slots__ = ()
+    
+    def get_id(self) -> int:
+        """Get dataset ID."""
+        return self[0]
+    
+    def get_name(self) -> str:
+        """Get dataset name."""
+        return self[1]
+    
+    def get_rows(self) -> int:
+        """Get number of rows."""
+        return self[2]
+    
+    def get_columns(self) -> int:
+        """Get number of columns."""
+        return self[3]
+    
+    def get_uploaded_by(self) -> str:
+        """Get uploader."""
+        return self[4]
+    
+    def get_upload_date(self) -> str:
+        """Get upload date."""
+        return self[5]
+    
+    def calculate_size_estimate(self) -> str:
+        """
+        Estimate dataset size based on rows and columns.
+        
+        Returns:
+            str: Human-readable size estimate
+        """
+        return estimate_size(self[2], self[3])
+    
+    def to_dict(self) -> dict:
+        """Convert dataset to dictionary."""
+        return {
+            'id': self[0],
+            'name': self[1],
+            'rows': self[2],
+            'columns': self[3],
+            'uploaded_by': self[4],
+            'upload_date': self[5]
+        }
+    
+    def __str__(self) -> str:
+        """String representation of dataset."""
+        return f"Dataset {self[0]}: {self[1]} ({self[2]} rows, {self[3]} cols)"
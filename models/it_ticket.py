@@ -1,8 +1,21 @@
 """IT Ticket entity class for IT operations."""
 
+# Priority name -> sortable level
+_PRIORITY_LEVELS = {
+    "low": 1,
+    "medium": 2,
+    "high": 3,
+    "critical": 4,
+}
+
+
 class ITTicket:
     """Represents an IT support ticket."""
     
+    # Slots instead of __dict__ keep large ticket lists compact
+    __slots__ = ('__id', '__priority', '__description', '__status', '__assigned_to',
+                 '__created_at', '__resolution_time_hours', '__priority_level')
+    
     def __init__(self, ticket_id: int, priority: str, description: str, 
                  status: str, assigned_to: str = None, created_at: str = None,
                  resolution_time_hours: int = None):
@@ -25,6 +38,7 @@ class ITTicket:
         self.__assigned_to = assigned_to
         self.__created_at = created_at
         self.__resolution_time_hours = resolution_time_hours
+        self.__priority_level = _PRIORITY_LEVELS.get((priority or "").lower(), 0)
     
     def get_id(self) -> int:
         """Get ticket ID."""
@@ -83,13 +97,7 @@ class ITTicket:
         Returns:
             int: Priority level (1=Low, 2=Medium, 3=High, 4=Critical)
         """
-        mapping = {
-            "low": 1,
-            "medium": 2,
-            "high": 3,
-            "critical": 4,
-        }
-        return mapping.get(self.__priority.lower(), 0)
+        return self.__priority_level
     
     def to_dict(self) -> dict:
         """Convert ticket to dictionary."""
@@ -109,4 +117,74 @@ class ITTicket:
             f"Ticket {self.__id}: {self.__description[:30]}... "
             f"[{self.__priority}] – {self.__status} "
             f"(assigned to: {self.__assigned_to or 'Unassigned'})"
-        )
\ No newline at end of file
+        )
+
+
+class TicketView(tuple):
+    """
+    Read-only ticket backed by a result row.
+    
+    List queries return these instead of ITTicket: wrapping the row tuple
+    costs nothing per field, and the getters match ITTicket's so display
+    code works with either. The row holds (ticket_id, priority,
+    description, status, assigned_to, created_at, resolution_time_hours).
+    """
+    
+    __slots__ = ()
+    
+    def get_id(self) -> int:
+        """Get ticket ID."""
+        return self[0]
+    
+    def get_priority(self) -> str:
+        """Get priority level."""
+        return self[1]
+    
+    def get_description(self) -> str:
+        """Get ticket description."""
+        return self[2]
+    
+    def get_status(self) -> str:
+        """Get current status."""
+        return self[3]
+    
+    def get_assigned_to(self) -> str:
+        """Get assignee."""
+        return self[4]
+    
+    def get_created_at(self) -> str:
+        """Get creation date."""
+        return self[5]
+    
+    def get_resolution_time_hours(self) -> int:
+        """Get resolution time in hours."""
+        return self[6]
+    
+    def get_priority_level(self) -> int:
+        """
+        Get numeric priority level for sorting.
+        
+        Returns:
+            int: Priority level (1=Low, 2=Medium, 3=High, 4=Critical)
+        """
+        return _PRIORITY_LEVELS.get((self[1] or "").lower(), 0)
+    
+    def to_dict(self) -> dict:
+        """Convert ticket to dictionary."""
+        return {
+            'id': self[0],
+            'priority': self[1],
+            'description': self[2],
+            'status': self[3],
+            'assigned_to': self[4],
+            'created_at': self[5],
+            'resolution_time_hours': self[6]
+        }
+    
+    def __str__(self) -> str:
+        """String representation of ticket."""
+        return (
+            f"Ticket {self[0]}: {self[2][:30]}... "
+            f"[{self[1]}] – {self[3]} "
+            f"(assigned to: {self[4] or 'Unassigned'})"
+        )
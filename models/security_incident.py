@@ -1,8 +1,21 @@
 """Security Incident entity class."""
 
+# Severity name -> sortable level
+_SEVERITY_LEVELS = {
+    "low": 1,
+    "medium": 2,
+    "high": 3,
+    "critical": 4,
+}
+
+
 class SecurityIncident:
     """Represents a cybersecurity incident in the platform."""
     
+    # get_all_incidents() builds one of these per row; skip the __dict__
+    __slots__ = ('__id', '__incident_type', '__severity', '__status', '__description',
+                 '__timestamp', '__reported_by', '__severity_level')
+    
     def __init__(self, incident_id: int, incident_type: str, severity: str, 
                  status: str, description: str, timestamp: str = None, 
                  reported_by: str = None):
@@ -25,6 +38,7 @@ class SecurityIncident:
         self.__description = description
         self.__timestamp = timestamp
         self.__reported_by = reported_by
+        self.__severity_level = _SEVERITY_LEVELS.get((severity or "").lower(), 0)
     
     def get_id(self) -> int:
         """Get incident ID."""
@@ -70,13 +84,7 @@ class SecurityIncident:
         Returns:
             int: Severity level (1=Low, 2=Medium, 3=High, 4=Critical)
         """
-        mapping = {
-            "low": 1,
-            "medium": 2,
-            "high": 3,
-            "critical": 4,
-        }
-        return mapping.get(self.__severity.lower(), 0)
+        return self.__severity_level
     
     def to_dict(self) -> dict:
         """Convert incident to dictionary."""
@@ -92,4 +100,71 @@ class SecurityIncident:
     
     def __str__(self) -> str:
         """String representation of incident."""
-        return f"Incident {self.__id} [{self.__severity.upper()}] {self.__incident_type} - {self.__status}"
\ No newline at end of file
+        return f"Incident {self.__id} [{self.__severity.upper()}] {self.__incident_type} - {self.__status}"
+
+
+class IncidentView(tuple):
+    """
+    Read-only incident backed by a result row.
+    
+    List queries return these instead of SecurityIncident: wrapping the
+    row tuple costs nothing per field, and the getters match
+    SecurityIncident's so display code works with either. The row holds
+    (incident_id, incident_type, severity, status, description, timestamp,
+    reported_by).
+    """
+    
+    __slots__ = ()
+    
+    def get_id(self) -> int:
+        """Get incident ID."""
+        return self[0]
+    
+    def get_incident_type(self) -> str:
+        """Get incident type."""
+        return self[1]
+    
+    def get_severity(self) -> str:
+        """Get severity level."""
+        return self[2]
+    
+    def get_status(self) -> str:
+        """Get current status."""
+        return self[3]
+    
+    def get_description(self) -> str:
+        """Get incident description."""
+        return self[4]
+    
+    def get_timestamp(self) -> str:
+        """Get incident timestamp."""
+        return self[5]
+    
+    def get_reported_by(self) -> str:
+        """Get reporter."""
+        return self[6]
+    
+    def get_severity_level(self) -> int:
+        """
+        Return an integer severity level for sorting/filtering.
+        
+        Returns:
+            int: Severity level (1=Low, 2=Medium, 3=High, 4=Critical)
+        """
+        return _SEVERITY_LEVELS.get((self[2] or "").lower(), 0)
+    
+    def to_dict(self) -> dict:
+        """Convert incident to dictionary."""
+        return {
+            'id': self[0],
+            'incident_type': self[1],
+            'severity': self[2],
+            'status': self[3],
+            'description': self[4],
+            'timestamp': self[5],
+            'reported_by': self[6]
+        }
+    
+    def __str__(self) -> str:
+        """String representation of incident."""
+        return f"Incident {self[0]} [{self[2].upper()}] {self[1]} - {self[3]}"
@@ -3,6 +3,8 @@
 class User:
     """Represents a user in the Multi-Domain Intelligence Platform."""
     
+    __slots__ = ('__id', '__username', '__password_hash', '__role')
+    
     def __init__(self, user_id: int, username: str, password_hash: str, role: str):
         """
         Initialize a User instance.
@@ -1,13 +1,9 @@
 import streamlit as st
-import pandas as pd
-from pathlib import Path
 
 # Import OOP services
-from services.database_manager import DatabaseManager
+from services.db_singleton import get_db
 from services.incident_service import IncidentService
-
-# Database path
-DB_PATH = Path("DATA") / "intelligence_platform.db"
+from services.session import require_login
 
 # Page configuration
 st.set_page_config(
@@ -15,31 +11,23 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state (local helper — other pages define this same helper)
-def initialize_session_state():
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    if "username" not in st.session_state:
-        st.session_state.username = ""
-    if "role" not in st.session_state:
-        st.session_state.role = ""
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
+# Initialize session state and require a valid login
+require_login()
 
+# Initialize services (OOP)
+db = get_db()
+incident_service = IncidentService(db)
 
-# Initialize session
-initialize_session_state()
 
-# Authentication check
-if not st.session_state.logged_in:
-    st.error("🚫 You must be logged in to view this page")
-    if st.button("Go to Login"):
-        st.switch_page("Home.py")
-    st.stop()
+# Incident data is not user-specific, so one cached copy serves every session.
+# Keyed on the incident data version like the Cybersecurity page's reads, so
+# a write made anywhere in the app shows at once. The leading underscore
+# stops Streamlit from hashing the service.
+@st.cache_data(ttl=60, show_spinner=False)
+def load_incident_trend(_service: IncidentService, version: tuple):
+    """Fetch the per-day incident counts aggregated in SQL."""
+    return _service.get_daily_counts()
 
-# Initialize services (OOP)
-db = DatabaseManager(str(DB_PATH))
-incident_service = IncidentService(db)
 
 # Dashboard content (only shown if logged in)
 st.title("Dashboard")
@@ -80,33 +68,16 @@ with col3:
 # show recent incidents
 st.header("Incident Trends")
 
-# Get actual incident data from database
-incidents = incident_service.get_all_incidents()
-
-if incidents:
-    # Parse timestamps and count incidents by date
-    dates = []
-    for inc in incidents:
-        try:
-            timestamp = pd.to_datetime(inc.get_timestamp())
-            dates.append(timestamp.date())
-        except Exception:
-            continue
+# Get actual incident data from database (cached)
+df_incidents = load_incident_trend(incident_service, incident_service.get_data_version())
+
+if not df_incidents.empty:
+    # Display the line chart
+    st.line_chart(df_incidents.set_index('date'))
     
-    if dates:
-        # Create a time series of incident counts by date
-        ts = pd.Series(dates).value_counts().sort_index()
-        df_incidents = ts.rename_axis('date').reset_index(name='count')
-        df_incidents['date'] = pd.to_datetime(df_incidents['date'])
-        
-        # Display the line chart
-        st.line_chart(df_incidents.set_index('date'))
-        
-        st.info(f"Showing incident activity from the last {len(df_incidents)} days")
-    else:
-        st.info("No incident data available for chart")
+    st.info(f"Showing incident activity from the last {len(df_incidents)} days")
 else:
-    st.info("No incidents recorded yet")
+    st.info("No incident data available for chart")
 
 # Sidebar with logout
 with st.sidebar:
@@ -120,6 +91,7 @@ with st.sidebar:
         st.session_state.logged_in = False
         st.session_state.username = ""
         st.session_state.role = ""
+        st.session_state.session_token = None
         st.write("You have been logged out")
         st.switch_page("Home.py")
 
@@ -127,6 +99,3 @@ with st.sidebar:
 st.markdown("---")
 if st.button(f"Ask  AI Assistant", use_container_width=True):
     st.switch_page("pages/6_AI_Assistant.py")
-
-# Close database connection when done
-db.close()
\ No newline at end of file
@@ -2,15 +2,14 @@
 Refactored Cybersecurity Page - Using OOP with SecurityIncident and IncidentService
 """
 import streamlit as st
+from collections import Counter
 import pandas as pd
-from pathlib import Path
+import altair as alt
 
 # Import OOP classes
-from services.database_manager import DatabaseManager
-from services.incident_service import IncidentService
-
-# Database path
-DB_PATH = Path("DATA") / "intelligence_platform.db"
+from services.db_singleton import get_db
+from services.incident_service import IncidentService, SEVERITY_CAT
+from services.session import require_login
 
 # Page configuration
 st.set_page_config(
@@ -18,44 +17,72 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-def initialize_session_state():
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    if "username" not in st.session_state:
-        st.session_state.username = ""
-    if "role" not in st.session_state:
-        st.session_state.role = ""
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
-
-initialize_session_state()
-
-# Authentication check
-if not st.session_state.logged_in:
-    st.error("🚫 You must be logged in to view this page")
-    if st.button("Go to Login"):
-        st.switch_page("Home.py")
-    st.stop()
+# Initialize session state and require a valid login
+require_login()
 
 # Initialize services (OOP)
-db = DatabaseManager(str(DB_PATH))
+db = get_db()
 incident_service = IncidentService(db)
 
+
+# Cached reads: `version` changes when incidents are added or removed and
+# after every write committed through the shared DatabaseManager, so edits
+# made on any page or session show at once. Only updates made outside the
+# app wait out the 60 second TTL. The leading underscore stops Streamlit
+# from hashing the service.
+@st.cache_data(ttl=60, show_spinner=False)
+def load_category_counts(_service: IncidentService, version: tuple):
+    return _service.get_incident_count_by_category()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_status_severity_counts(_service: IncidentService, version: tuple):
+    return _service.get_status_severity_counts()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_recent_incidents_df(_service: IncidentService, version: tuple):
+    return _service.get_recent_df(20)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_daily_counts(_service: IncidentService, version: tuple):
+    return _service.get_daily_counts()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_incident_picker(_service: IncidentService, version: tuple):
+    return {
+        f"Incident {incident_id}: {category} [{severity}]": incident_id
+        for incident_id, category, severity in _service.get_recent_summaries(10)
+    }
+
+
+def clear_incident_caches():
+    load_incident_picker.clear()
+    load_daily_counts.clear()
+    load_recent_incidents_df.clear()
+    load_category_counts.clear()
+    load_status_severity_counts.clear()
+
+
+data_version = incident_service.get_data_version()
+
 # Title
 st.title("🔒 Cybersecurity Dashboard")
 
-# Get all incidents using the service
-incidents = incident_service.get_all_incidents()
+# The stamp's row count says whether there are any incidents to show
+has_incidents = data_version[1] > 0
 
 # Security metrics
 st.header("Security Metrics")
 col1, col2, col3 = st.columns(3)
 
-# Calculate metrics from incident objects
-open_count = len([i for i in incidents if i.get_status() == "Open"])
-high_critical_count = len([i for i in incidents if i.get_severity() in ["High", "Critical"]])
-resolved_count = len([i for i in incidents if i.get_status() == "Resolved"])
+# Calculate metrics from the (status, severity) counts aggregated in SQL
+status_severity_counts = load_status_severity_counts(incident_service, data_version)
+open_count = sum(n for (status, _), n in status_severity_counts.items() if status == "Open")
+high_critical_count = sum(n for (_, sev), n in status_severity_counts.items() if sev in ("High", "Critical"))
+resolved_count = sum(n for (status, _), n in status_severity_counts.items() if status == "Resolved")
 
 with col1:
     st.metric("Open Incidents", open_count)
@@ -69,90 +96,74 @@ with col3:
 # Threat distribution
 st.header("Threat Distribution by Category")
 
-# Get category counts using service
-category_counts = incident_service.get_incident_count_by_category()
-
-# Chart selector
-st.subheader("Charts")
-chart_type = st.selectbox(
-    "Select chart type",
-    [
-        "Threat Distribution (Bar)",
-        "Incident Trend (Line)",
-        "Severity Breakdown (Pie)"
-    ]
-)
-# Render selected chart
-if chart_type == "Threat Distribution (Bar)":
-    if category_counts:
-        threat_data = pd.DataFrame({
-            "Threat Type": list(category_counts.keys()),
-            "Count": list(category_counts.values())
-        })
-        st.bar_chart(threat_data.set_index("Threat Type"))
-    else:
-        st.info("No threat data available")
-
-elif chart_type == "Incident Trend (Line)":
-    if incidents:
-        # Build time series of incident counts by date
-        dates = []
-        for inc in incidents:
-            try:
-                dates.append(pd.to_datetime(inc.get_timestamp()).date())
-            except Exception:
-                # If timestamp not parseable, skip
-                continue
-
-        if dates:
-            ts = pd.Series(dates).value_counts().sort_index() # Time series of counts
-            df_ts = ts.rename_axis('date').reset_index(name='count') # DataFrame for charting
-            df_ts['date'] = pd.to_datetime(df_ts['date']) # Ensure datetime format
-            st.line_chart(df_ts.set_index('date')) # Display line chart
+
+# Charts run as a fragment: changing the chart type reruns only this block,
+# and other widgets on the page do not redraw the chart
+@st.fragment
+def render_charts(status_severity_counts: dict):
+    # Chart selector
+    st.subheader("Charts")
+    chart_type = st.selectbox(
+        "Select chart type",
+        [
+            "Threat Distribution (Bar)",
+            "Incident Trend (Line)",
+            "Severity Breakdown (Pie)"
+        ]
+    )
+    # Render selected chart
+    if chart_type == "Threat Distribution (Bar)":
+        # Only this chart needs the per-category aggregation
+        category_counts = load_category_counts(incident_service, data_version)
+        if category_counts:
+            threat_data = pd.DataFrame({
+                "Threat Type": list(category_counts.keys()),
+                "Count": list(category_counts.values())
+            })
+            st.bar_chart(threat_data.set_index("Threat Type"))
+        else:
+            st.info("No threat data available")
+
+    elif chart_type == "Incident Trend (Line)":
+        df_ts = load_daily_counts(incident_service, data_version)
+        if not df_ts.empty:
+            st.line_chart(df_ts.set_index('date'))
         else:
             st.info("No timestamped incidents available for trend")
-    else:
-        st.info("No incidents found")
-
-else:  # Severity Breakdown (Pie)
-    if incidents:
-        severity_counts = {} # Count by severity
-        for inc in incidents:
-            sev = inc.get_severity() or "Unknown"
-            severity_counts[sev] = severity_counts.get(sev, 0) + 1 # Tally counts using OOP method
-        # Render pie chart
-        if severity_counts:
-            df_sev = pd.DataFrame({
-                'Severity': list(severity_counts.keys()),
-                'Count': list(severity_counts.values())
-            })
-            import matplotlib.pyplot as plt
-            fig, ax = plt.subplots()
-            ax.pie(df_sev['Count'], labels=df_sev['Severity'], autopct='%1.1f%%')
-            ax.set_title('Incidents by Severity')
-            st.pyplot(fig)
+
+    else:  # Severity Breakdown (Pie)
+        if status_severity_counts:
+            # Count by severity, folding the (status, severity) counts from SQL
+            severity_counts = Counter()
+            for (_, sev), n in status_severity_counts.items():
+                severity_counts[sev or "Unknown"] += n
+            # Render pie chart
+            if severity_counts:
+                df_sev = pd.DataFrame({
+                    'Severity': list(severity_counts.keys()),
+                    'Count': list(severity_counts.values())
+                })
+                pie = alt.Chart(df_sev, title='Incidents by Severity').mark_arc().encode(
+                    theta='Count:Q',
+                    color=alt.Color('Severity:N', sort=list(SEVERITY_CAT.categories)),
+                    tooltip=['Severity', 'Count']
+                )
+                st.altair_chart(pie, use_container_width=True)
+            else:
+                st.info("No severity data available")
         else:
-            st.info("No severity data available")
-    else:
-        st.info("No incidents found")
+            st.info("No incidents found")
+
+
+render_charts(status_severity_counts)
 
 # Display incidents table
 st.header("Recent Security Incidents")
 
-if incidents:
-    # Convert incident objects to DataFrame for display
-    incident_data = []
-    for incident in incidents[:20]:  # Show first 20
-        incident_data.append({
-            'ID': incident.get_id(),
-            'Type': incident.get_incident_type(),
-            'Severity': incident.get_severity(),
-            'Status': incident.get_status(),
-            'Description': incident.get_description()[:50] + "...",
-            'Timestamp': incident.get_timestamp()
-        })
-    
-    df = pd.DataFrame(incident_data)
+if has_incidents:
+    # Read the 20 most recent rows straight into a DataFrame for display
+    df = load_recent_incidents_df(incident_service, data_version)
+    df.columns = ['ID', 'Type', 'Severity', 'Status', 'Description', 'Timestamp']
     st.dataframe(df, use_container_width=True)
 else:
     st.info("No incidents found")
@@ -171,7 +182,7 @@ with st.form("add_incident"):
     
     severity = st.selectbox(
         "Severity",
-        ["Low", "Medium", "High", "Critical"]
+        list(SEVERITY_CAT.categories)
     )
     
     description = st.text_area("Description")
@@ -186,21 +197,19 @@ with st.form("add_incident"):
             description=description,
             reported_by=st.session_state.username
         )
+        clear_incident_caches()
         st.success(f"✅ Incident #{new_id} created successfully!")
         st.rerun()
 
 # UPDATE - Modify incident status
 st.subheader("Update Incident Status")
 
-if incidents:
-    # Create selection list
-    incident_options = {
-        f"Incident {i.get_id()}: {i.get_incident_type()} [{i.get_severity()}]": i
-        for i in incidents[:10]
-    }
+if has_incidents:
+    # Create selection list (labels -> ids), then load just the chosen incident
+    incident_options = load_incident_picker(incident_service, data_version)
     
     selected_key = st.selectbox("Select incident to update", list(incident_options.keys()))
-    selected_incident = incident_options[selected_key]
+    selected_incident = incident_service.get_incident_by_id(incident_options[selected_key])
     
     # Display current status
     st.write(f"Current Status: **{selected_incident.get_status()}**")
@@ -223,6 +232,7 @@ if incidents:
             )
             
             if success:
+                clear_incident_caches()
                 st.success("✅ Incident status updated!")
                 st.rerun()
             else:
@@ -241,6 +251,7 @@ if incidents:
             success = incident_service.delete_incident(selected_incident.get_id())
             
             if success:
+                clear_incident_caches()
                 st.success("✅ Incident deleted!")
                 st.rerun()
             else:
@@ -257,6 +268,3 @@ with col1:
 with col2:
     if st.button("🤖 Ask AI Assistant", use_container_width=True):
         st.switch_page("pages/6_AI_Assistant.py")
-
-# Close database connection
-db.close()
\ No newline at end of file
@@ -3,14 +3,13 @@ Refactored Data Science Page - Using OOP with Dataset and DatasetService
 """
 import streamlit as st
 import pandas as pd
-from pathlib import Path
+import altair as alt
 
 # Import OOP classes
-from services.database_manager import DatabaseManager
+from services.db_singleton import get_db
+from models.dataset import estimate_size
 from services.dataset_service import DatasetService
-
-# Database path
-DB_PATH = Path("DATA") / "intelligence_platform.db"
+from services.session import require_login
 
 # Page configuration
 st.set_page_config(
@@ -18,38 +17,47 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-def initialize_session_state():
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    if "username" not in st.session_state:
-        st.session_state.username = ""
-    if "role" not in st.session_state:
-        st.session_state.role = ""
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
-
-initialize_session_state()
-
-# Authentication check
-if not st.session_state.logged_in:
-    st.error("🚫 You must be logged in to view this page")
-    if st.button("Go to Login"):
-        st.switch_page("Home.py")
-    st.stop()
+# Initialize session state and require a valid login
+require_login()
 
 # Initialize services (OOP)
-db = DatabaseManager(str(DB_PATH))
+db = get_db()
 dataset_service = DatasetService(db)
 
 # Title
 st.title("📈 Data Science Dashboard")
 
+# Cached reads keyed on a version stamp, so unchanged data is served from
+# memory. The stamp changes when datasets are added or removed and after
+# every write committed through the shared DatabaseManager; only updates
+# made outside the app wait out the 60 second TTL.
+@st.cache_data(ttl=60, show_spinner=False)
+def load_datasets(_service: DatasetService, version: tuple):
+    return _service.get_all_datasets()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_datasets_df(_service: DatasetService, version: tuple):
+    return _service.get_all_df()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_uploaders(_service: DatasetService, version: tuple):
+    return _service.get_uploaders()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_dataset_statistics(_service: DatasetService, version: tuple):
+    return _service.get_dataset_statistics()
+
+
+data_version = dataset_service.get_data_version()
+
 # Get all datasets using the service
-datasets = dataset_service.get_all_datasets()
+datasets = load_datasets(dataset_service, data_version)
 
 # Get statistics
-stats = dataset_service.get_dataset_statistics()
+stats = load_dataset_statistics(dataset_service, data_version)
 
 # Model performance metrics (placeholder)
 st.header("Platform Statistics")
@@ -64,29 +72,10 @@ with col2:
 with col3:
     st.metric("Avg Columns", stats['avg_columns'])
 
-# Display datasets
-st.header("Available Datasets")
-
-if datasets:
-    # Convert dataset objects to DataFrame for display
-    dataset_data = []
-    for dataset in datasets:
-        dataset_data.append({
-            'ID': dataset.get_id(),
-            'Name': dataset.get_name(),
-            'Rows': f"{dataset.get_rows():,}",
-            'Columns': dataset.get_columns(),
-            'Uploaded By': dataset.get_uploaded_by(),
-            'Upload Date': dataset.get_upload_date(),
-            'Est. Size': dataset.calculate_size_estimate()
-        })
-    
-    df = pd.DataFrame(dataset_data)
-    st.dataframe(df, use_container_width=True)
-    
-    # Dataset sizes visualization
-    st.subheader("Dataset Comparison")
-    
+# Charts run as a fragment: changing the chart type reruns only this block,
+# and other widgets on the page do not redraw the chart
+@st.fragment
+def render_charts(datasets: list):
     # Create chart data
     chart_data = pd.DataFrame({
         'Dataset': [d.get_name() for d in datasets],
@@ -116,13 +105,34 @@ if datasets:
         uploaders = chart_data['Uploader'].fillna('Unknown')
         uploader_counts = uploaders.value_counts()
         if not uploader_counts.empty:
-            import matplotlib.pyplot as plt
-            fig, ax = plt.subplots()
-            ax.pie(uploader_counts.values, labels=uploader_counts.index, autopct='%1.1f%%')
-            ax.set_title('Datasets by Uploader')
-            st.pyplot(fig)
+            df_uploaders = uploader_counts.rename_axis('Uploader').reset_index(name='Count')
+            pie = alt.Chart(df_uploaders, title='Datasets by Uploader').mark_arc().encode(
+                theta='Count:Q', color='Uploader:N', tooltip=['Uploader', 'Count']
+            )
+            st.altair_chart(pie, use_container_width=True)
         else:
             st.info('No uploader data available')
+
+
+# Display datasets
+st.header("Available Datasets")
+
+if datasets:
+    # Read the table rows straight into a DataFrame for display
+    df = load_datasets_df(dataset_service, data_version)
+    df.columns = ['ID', 'Name', 'Rows', 'Columns', 'Uploaded By', 'Upload Date']
+    df['Est. Size'] = [estimate_size(r, c) for r, c in zip(df['Rows'], df['Columns'])]
+    # Rows stays numeric so it sorts correctly; the column config adds separators
+    st.dataframe(
+        df,
+        use_container_width=True,
+        column_config={"Rows": st.column_config.NumberColumn("Rows", format="localized")}
+    )
+    
+    # Dataset sizes visualization
+    st.subheader("Dataset Comparison")
+    
+    render_charts(datasets)
     
 else:
     st.info("No datasets found")
@@ -167,13 +177,14 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Get unique uploaders
-    uploaders = list(set([d.get_uploaded_by() for d in datasets if d.get_uploaded_by()]))
+    uploaders = load_uploaders(dataset_service, data_version)
     
     if uploaders:
         selected_uploader = st.selectbox("Filter by uploader", ["All"] + uploaders)
         
         if selected_uploader != "All":
-            filtered_datasets = dataset_service.get_datasets_by_uploader(selected_uploader)
+            # Filter the datasets already loaded above instead of re-querying
+            filtered_datasets = [d for d in datasets if d.get_uploaded_by() == selected_uploader]
             st.write(f"**Datasets uploaded by {selected_uploader}:** {len(filtered_datasets)}")
             
             for dataset in filtered_datasets:
@@ -203,6 +214,3 @@ with col1:
 with col2:
     if st.button("🤖 Ask AI Assistant", use_container_width=True):
         st.switch_page("pages/6_AI_Assistant.py")
-
-# Close database connection
-db.close()
\ No newline at end of file
@@ -3,14 +3,12 @@ Refactored IT Operations Page - Using OOP with ITTicket and TicketService
 """
 import streamlit as st
 import pandas as pd
-from pathlib import Path
+import altair as alt
 
 # Import OOP classes
-from services.database_manager import DatabaseManager
-from services.ticket_service import TicketService
-
-# Database path
-DB_PATH = Path("DATA") / "intelligence_platform.db"
+from services.db_singleton import get_db
+from services.ticket_service import TicketService, PRIORITY_CAT
+from services.session import require_login
 
 # Page configuration
 st.set_page_config(
@@ -18,38 +16,57 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-def initialize_session_state():
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    if "username" not in st.session_state:
-        st.session_state.username = ""
-    if "role" not in st.session_state:
-        st.session_state.role = ""
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
-
-initialize_session_state()
-
-# Authentication check
-if not st.session_state.logged_in:
-    st.error("🚫 You must be logged in to view this page")
-    if st.button("Go to Login"):
-        st.switch_page("Home.py")
-    st.stop()
+# Initialize session state and require a valid login
+require_login()
 
 # Initialize services (OOP)
-db = DatabaseManager(str(DB_PATH))
+db = get_db()
 ticket_service = TicketService(db)
 
 # Title
 st.title("🖥️ IT Operations Dashboard")
 
-# Get all tickets using the service
-tickets = ticket_service.get_all_tickets()
+# Cached reads: `version` changes when tickets are added or removed and
+# after every write committed through the shared DatabaseManager, so edits
+# made on any page or session show at once. Only updates made outside the
+# app wait out the 60 second TTL.
+@st.cache_data(ttl=60, show_spinner=False)
+def load_ticket_statistics(_service: TicketService, version: tuple):
+    return _service.get_ticket_statistics()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_recent_tickets_df(_service: TicketService, version: tuple):
+    return _service.get_recent_df(30)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_daily_counts(_service: TicketService, version: tuple):
+    return _service.get_daily_counts()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_ticket_picker(_service: TicketService, version: tuple):
+    return {
+        f"Ticket {ticket_id}: {description}...": ticket_id
+        for ticket_id, description in _service.get_recent_summaries(15, 40)
+    }
+
+
+def clear_ticket_caches():
+    load_ticket_picker.clear()
+    load_daily_counts.clear()
+    load_recent_tickets_df.clear()
+    load_ticket_statistics.clear()
+
+
+data_version = ticket_service.get_data_version()
+
+# The stamp's row count says whether there are any tickets to show
+has_tickets = data_version[1] > 0
 
 # Get statistics
-stats = ticket_service.get_ticket_statistics()
+stats = load_ticket_statistics(ticket_service, data_version)
 
 # System health metrics (placeholder)
 st.header("System Health")
@@ -85,70 +102,56 @@ with col4:
     closed_count = stats['by_status'].get('Closed', 0)
     st.metric("Completed", resolved_count + closed_count)
 
-# Chart selector for tickets
-st.subheader("Charts")
-ticket_chart = st.selectbox(
-    "Select chart type",
-    ["Tickets by Status (Bar)", "Tickets by Priority (Pie)", "Ticket Trend (Line)"]
-)
+# Charts run as a fragment: changing the chart type reruns only this block,
+# and other widgets on the page do not redraw the chart
+@st.fragment
+def render_charts(stats: dict):
+    # Chart selector for tickets
+    st.subheader("Charts")
+    ticket_chart = st.selectbox(
+        "Select chart type",
+        ["Tickets by Status (Bar)", "Tickets by Priority (Pie)", "Ticket Trend (Line)"]
+    )
+
+    if ticket_chart == "Tickets by Status (Bar)":
+        status_counts = stats.get('by_status', {})
+        if status_counts:
+            df_status = pd.DataFrame({'Status': list(status_counts.keys()), 'Count': list(status_counts.values())})
+            st.bar_chart(df_status.set_index('Status'))
+        else:
+            st.info('No status data available')
+
+    elif ticket_chart == "Tickets by Priority (Pie)":
+        prio_counts = stats.get('by_priority', {})
+        if prio_counts:
+            df_prio = pd.DataFrame({'Priority': list(prio_counts.keys()), 'Count': list(prio_counts.values())})
+            pie = alt.Chart(df_prio, title='Tickets by Priority').mark_arc().encode(
+                theta='Count:Q',
+                color=alt.Color('Priority:N', sort=list(PRIORITY_CAT.categories)),
+                tooltip=['Priority', 'Count']
+            )
+            st.altair_chart(pie, use_container_width=True)
+        else:
+            st.info('No priority data available')
 
-if ticket_chart == "Tickets by Status (Bar)":
-    status_counts = stats.get('by_status', {})
-    if status_counts:
-        import pandas as _pd
-        df_status = _pd.DataFrame({'Status': list(status_counts.keys()), 'Count': list(status_counts.values())})
-        st.bar_chart(df_status.set_index('Status'))
-    else:
-        st.info('No status data available')
-
-elif ticket_chart == "Tickets by Priority (Pie)":
-    prio_counts = stats.get('by_priority', {})
-    if prio_counts:
-        import matplotlib.pyplot as plt
-        fig, ax = plt.subplots()
-        ax.pie(list(prio_counts.values()), labels=list(prio_counts.keys()), autopct='%1.1f%%')
-        ax.set_title('Tickets by Priority')
-        st.pyplot(fig)
-    else:
-        st.info('No priority data available')
-
-else:  # Ticket Trend (Line)
-    if tickets:
-        import pandas as _pd
-        dates = []
-        for t in tickets:
-            try:
-                dates.append(_pd.to_datetime(t.get_created_at()).date())
-            except Exception:
-                continue
-
-        if dates:
-            ts = _pd.Series(dates).value_counts().sort_index()
-            df_ts = ts.rename_axis('date').reset_index(name='count')
-            df_ts['date'] = _pd.to_datetime(df_ts['date'])
+    else:  # Ticket Trend (Line)
+        df_ts = load_daily_counts(ticket_service, data_version)
+        if not df_ts.empty:
             st.line_chart(df_ts.set_index('date'))
         else:
             st.info('No ticket timestamps available for trend')
-    else:
-        st.info('No tickets found')
+
+
+render_charts(stats)
 
 # Display tickets
 st.header("IT Tickets")
 
-if tickets:
-    # Convert ticket objects to DataFrame for display
-    ticket_data = []
-    for ticket in tickets[:30]:  # Show first 30
-        ticket_data.append({
-            'ID': ticket.get_id(),
-            'Priority': ticket.get_priority(),
-            'Status': ticket.get_status(),
-            'Description': ticket.get_description()[:40] + "...",
-            'Assigned To': ticket.get_assigned_to() or "Unassigned",
-            'Created': ticket.get_created_at()
-        })
-    
-    df = pd.DataFrame(ticket_data)
+if has_tickets:
+    # Read the 30 most recent rows straight into a DataFrame for display
+    df = load_recent_tickets_df(ticket_service, data_version)
+    df.columns = ['ID', 'Priority', 'Status', 'Description', 'Assigned To', 'Created']
+    df['Assigned To'] = df['Assigned To'].fillna("Unassigned")
     st.dataframe(df, use_container_width=True)
 else:
     st.info("No tickets found")
@@ -162,7 +165,7 @@ with st.form("add_ticket"):
     
     priority = st.selectbox(
         "Priority",
-        ["Low", "Medium", "High", "Critical"]
+        list(PRIORITY_CAT.categories)
     )
     
     description = st.text_area("Description")
@@ -183,21 +186,19 @@ with st.form("add_ticket"):
             description=description,
             assigned_to=assign_value
         )
+        clear_ticket_caches()
         st.success(f"✅ Ticket #{new_id} created successfully!")
         st.rerun()
 
 # UPDATE - Modify ticket
 st.subheader("Update Ticket")
 
-if tickets:
-    # Create selection list
-    ticket_options = {
-        f"Ticket {t.get_id()}: {t.get_description()[:40]}...": t
-        for t in tickets[:15]
-    }
+if has_tickets:
+    # Create selection list (labels -> ids), then load just the chosen ticket
+    ticket_options = load_ticket_picker(ticket_service, data_version)
     
     selected_key = st.selectbox("Select ticket to update", list(ticket_options.keys()))
-    selected_ticket = ticket_options[selected_key]
+    selected_ticket = ticket_service.get_ticket_by_id(ticket_options[selected_key])
     
     # Display current info
     col1, col2 = st.columns(2)
@@ -227,20 +228,15 @@ if tickets:
             )
         
         if st.form_submit_button("Update Ticket"):
-            # Update status
-            success_status = ticket_service.update_ticket_status(
+            # Update status, and the assignee if changed, in one statement
+            success = ticket_service.update_status_and_assignee(
                 selected_ticket.get_id(),
-                new_status
+                new_status,
+                None if new_assignee == "Keep Current" else new_assignee
             )
             
-            # Update assignee if changed
-            if new_assignee != "Keep Current":
-                success_assign = ticket_service.assign_ticket(
-                    selected_ticket.get_id(),
-                    new_assignee
-                )
-            
-            if success_status:
+            if success:
+                clear_ticket_caches()
                 st.success("✅ Ticket updated!")
                 st.rerun()
             else:
@@ -264,7 +260,7 @@ with col1:
 with col2:
     priority_filter = st.selectbox(
         "Filter by Priority",
-        ["All", "Low", "Medium", "High", "Critical"]
+        ["All"] + list(PRIORITY_CAT.categories)
     )
     
     if priority_filter != "All":
@@ -282,6 +278,3 @@ with col1:
 with col2:
     if st.button("🤖 Ask AI Assistant", use_container_width=True):
         st.switch_page("pages/6_AI_Assistant.py")
-
-# Close database connection
-db.close()
\ No newline at end of file
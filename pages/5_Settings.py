@@ -1,32 +1,14 @@
 import streamlit as st
 from datetime import datetime
+from services.session import require_login
 # Page configuration
 st.set_page_config(
     page_title="Settings",
     layout="wide"
 )
 
-# Initialize session state (defined locally to match other pages)
-def initialize_session_state():
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    if "username" not in st.session_state:
-        st.session_state.username = ""
-    if "role" not in st.session_state:
-        st.session_state.role = ""
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
-
-
-# Initialize session
-initialize_session_state()
-
-# Authentication check
-if not st.session_state.logged_in:
-    st.error("🚫 You must be logged in to view this page")
-    if st.button("Go to Login"):
-        st.switch_page("Home.py")
-    st.stop()
+# Initialize session state and require a valid login
+require_login()
 # Title
 st.title("⚙️ Settings")
 
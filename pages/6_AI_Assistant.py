@@ -2,22 +2,16 @@ import streamlit as st
 import os
 from openai import OpenAI
 from dotenv import load_dotenv
+from services.session import require_login
 # Page configuration 
 st.set_page_config(
     page_title="AI Assistant",
     page_icon="🤖",
     layout="wide"
 )
+# Initialize session state and require a valid login
+require_login()
 load_dotenv()  # Load .env file
-def initialize_session_state():
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    if "username" not in st.session_state:
-        st.session_state.username = ""
-    if "role" not in st.session_state:
-        st.session_state.role = ""
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
 # Initialize OpenAI client
 try:
     # Try environment variable first, then Streamlit secrets, then .env file
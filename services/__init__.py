@@ -1,9 +1,9 @@
 
 from services.database_manager import DatabaseManager
 from services.auth_manager import AuthManager, PasswordHasher
-from services.incident_service import IncidentService
+from services.incident_service import IncidentService, SEVERITY_CAT
 from services.dataset_service import DatasetService
-from services.ticket_service import TicketService
+from services.ticket_service import TicketService, PRIORITY_CAT
 
 __all__ = [
     'DatabaseManager',
@@ -11,5 +11,7 @@ __all__ = [
     'PasswordHasher',
     'IncidentService',
     'DatasetService',
-    'TicketService'
+    'TicketService',
+    'SEVERITY_CAT',
+    'PRIORITY_CAT'
 ]
\ No newline at end of file
@@ -1,16 +1,115 @@
 """Authentication Manager service class."""
 
+import asyncio
+import hashlib
+import hmac
+import os
+import re
+import secrets
+import threading
+import time
 import bcrypt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 from models.user import User
 from services.database_manager import DatabaseManager
 
 
+# Target wall-time for a single hash, used to pick the bcrypt cost factor
+BCRYPT_TARGET_MS = 100
+
+
+def calibrate_bcrypt_rounds(target_ms: float = BCRYPT_TARGET_MS,
+                            min_rounds: int = 10, max_rounds: int = 14) -> int:
+    """
+    Pick the largest bcrypt cost whose hash time fits within a budget.
+    
+    Each extra round doubles the work, so the loop stops at the first
+    cost that goes over budget.
+    
+    Args:
+        target_ms: Time budget for one hash in milliseconds
+        min_rounds: Lowest cost factor to accept
+        max_rounds: Highest cost factor to try
+        
+    Returns:
+        int: Calibrated cost factor
+    """
+    rounds = min_rounds
+    for candidate in range(min_rounds, max_rounds + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"x", bcrypt.gensalt(candidate))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > target_ms:
+            break
+        rounds = candidate
+    return rounds
+
+
+# Auth queries, kept as constants so the connection's statement cache
+# (keyed on the SQL text) reuses the compiled statements across logins
+_SQL_USER_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+_SQL_INSERT_USER = """INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)
+                      ON CONFLICT(username) DO NOTHING"""
+_SQL_SELECT_USER = "SELECT id, username, password_hash, role FROM users WHERE username = ?"
+_SQL_UPDATE_HASH = "UPDATE users SET password_hash = ? WHERE id = ?"
+
+# Every strength rule in one pass over the password: at least 8 characters,
+# an uppercase letter, a lowercase letter and a digit
+_STRONG_PASSWORD_RE = re.compile(r"(?=.*[A-Z])(?=.*[a-z])(?=.*\d).{8,}", re.DOTALL)
+
+# Calibrated once per process rather than per request. The cost has to rise
+# with hardware speed, so deployments can pin the value they measured by
+# setting BCRYPT_ROUNDS, which also skips the startup probe.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "0")) or calibrate_bcrypt_rounds()
+
+# bcrypt releases the GIL while hashing, so worker threads run in parallel.
+# Without the pool every login hashes on the Streamlit script thread and
+# concurrent logins queue up behind each other. The pool's threads mark
+# themselves in _bcrypt_worker: work already running on one (see
+# login_user_async) hashes inline, instead of queueing a second pool task
+# and holding two threads while it waits for it.
+_bcrypt_worker = threading.local()
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(),
+                                  thread_name_prefix="bcrypt",
+                                  initializer=lambda: setattr(_bcrypt_worker, 'active', True))
+
+
+def _run_bcrypt(func, *args):
+    """Run a bcrypt call on the pool, or inline on one of its workers."""
+    if getattr(_bcrypt_worker, 'active', False):
+        return func(*args)
+    return _BCRYPT_POOL.submit(func, *args).result()
+
+
+# Successful logins are remembered this long so an immediate re-login skips
+# bcrypt. Entries are keyed on an HMAC of the password under a per-process
+# key, so the plain password is never stored.
+LOGIN_CACHE_TTL_SECONDS = 60
+_LOGIN_CACHE_MAX_ENTRIES = 1024
+_LOGIN_CACHE_KEY = secrets.token_bytes(32)
+
+# Most logins one AuthManager checks at once, per event loop, through
+# login_user_async().
+# Callers beyond this wait on the event loop instead of piling work onto
+# the bcrypt pool, so a burst of guesses cannot starve other requests.
+ASYNC_LOGIN_LIMIT = os.cpu_count() or 1
+
+
 class PasswordHasher:
     """Handles password hashing and verification using bcrypt."""
     
-    @staticmethod
-    def hash_password(plain_password: str) -> str:
+    def __init__(self, rounds: Optional[int] = None):
+        """
+        Initialize PasswordHasher.
+        
+        Args:
+            rounds: bcrypt cost factor for new hashes (default: BCRYPT_ROUNDS)
+        """
+        self._rounds = rounds if rounds is not None else BCRYPT_ROUNDS
+    
+    def hash_password(self, plain_password: str) -> str:
         """
         Hash a plain text password.
         
@@ -20,9 +119,8 @@ class PasswordHasher:
         Returns:
             str: Hashed password
         """
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(plain_password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        salt = bcrypt.gensalt(rounds=self._rounds)
+        return _run_bcrypt(bcrypt.hashpw, plain_password.encode('utf-8'), salt).decode('utf-8')
     
     @staticmethod
     def check_password(plain_password: str, hashed_password: str) -> bool:
@@ -37,26 +135,68 @@ class PasswordHasher:
             bool: True if password matches
         """
         try:
-            return bcrypt.checkpw(
+            return _run_bcrypt(
+                bcrypt.checkpw,
                 plain_password.encode('utf-8'),
                 hashed_password.encode('utf-8')
             )
         except Exception:
             return False
+    
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash uses a weaker cost than the current one.
+        
+        bcrypt hashes carry their cost ("$2b$12$..."), so hashes made before
+        a cost increase can be upgraded the next time the user logs in.
+        
+        Args:
+            hashed_password: Stored bcrypt hash
+            
+        Returns:
+            bool: True if the hash should be regenerated
+        """
+        try:
+            return int(hashed_password.split('$')[2]) < self._rounds
+        except (IndexError, ValueError):
+            return False
 
 
 class AuthManager:
     """Handles user registration and authentication."""
     
-    def __init__(self, db: DatabaseManager):
+    def __init__(self, db: DatabaseManager, hasher=None,
+                 target_ms: Optional[float] = None):
         """
         Initialize AuthManager.
         
         Args:
             db: DatabaseManager instance for database operations
+            hasher: Object with hash_password/check_password/needs_rehash methods
+                (default: in-process PasswordHasher). Pass a client for a
+                remote hashing worker to move bcrypt out of the app process.
+            target_ms: Hash time budget to calibrate the default hasher's
+                cost for (default: use the process-wide BCRYPT_ROUNDS)
         """
         self._db = db
-        self._hasher = PasswordHasher()
+        if hasher is None:
+            rounds = calibrate_bcrypt_rounds(target_ms) if target_ms is not None else None
+            hasher = PasswordHasher(rounds)
+        self._hasher = hasher
+        # Checked when a login names an unknown user, so that case costs the
+        # same bcrypt work as a wrong password and does not reveal which
+        # users exist
+        self._dummy_hash = self._hasher.hash_password(secrets.token_hex(16))
+        # (username, password HMAC) -> (user fields, expiry), oldest first.
+        # The AuthManager is shared by every session thread, so the cache is
+        # only touched while holding the lock.
+        self._login_cache = OrderedDict()
+        self._login_cache_lock = threading.Lock()
+        # Event loop -> its login semaphore. An asyncio.Semaphore binds to the
+        # first loop it waits on, and each asyncio.run() caller brings its own
+        # loop, so one shared semaphore would fail on the next loop.
+        self._login_slots = {}
+        self._login_slots_lock = threading.Lock()
     
     def validate_password(self, password: str) -> Tuple[bool, str]:
         """
@@ -68,34 +208,69 @@ class AuthManager:
         Returns:
             tuple: (is_valid: bool, error_message: str)
         """
+        # Valid passwords, the common case, need only the regex pass; the
+        # per-rule checks below run just to explain a rejection
+        if _STRONG_PASSWORD_RE.fullmatch(password):
+            return True, "Password is valid"
+        
         if len(password) < 8:
             return False, "Password must be at least 8 characters long"
         
-        if not any(c.isupper() for c in password):
+        # Classify each distinct character once instead of scanning per rule
+        has_upper = has_lower = has_digit = False
+        for c in set(password):
+            if c.isupper():
+                has_upper = True
+            elif c.islower():
+                has_lower = True
+            elif c.isdigit():
+                has_digit = True
+        
+        if not has_upper:
             return False, "Password must contain at least one uppercase letter"
         
-        if not any(c.islower() for c in password):
+        if not has_lower:
             return False, "Password must contain at least one lowercase letter"
         
-        if not any(c.isdigit() for c in password):
+        if not has_digit:
             return False, "Password must contain at least one number"
         
         return True, "Password is valid"
     
+    def _login_cache_key(self, username: str, password: str) -> tuple:
+        """Build the login cache key for a username/password pair."""
+        digest = hmac.new(_LOGIN_CACHE_KEY, password.encode('utf-8'), hashlib.sha256).digest()
+        return username, digest
+    
+    def clear_login_cache(self, username: Optional[str] = None) -> None:
+        """
+        Forget cached logins, e.g. after a password change.
+        
+        Args:
+            username: Only forget this user's entries (default: all users)
+        """
+        with self._login_cache_lock:
+            if username is None:
+                self._login_cache.clear()
+                return
+            
+            for key in [k for k in self._login_cache if k[0] == username]:
+                del self._login_cache[key]
+    
     def user_exists(self, username: str) -> bool:
         """
         Check if a username already exists.
         
+        Not needed before register_user(), which reports a taken username
+        itself; checking first would only reopen the race between the two.
+        
         Args:
             username: Username to check
             
         Returns:
             bool: True if user exists
         """
-        row = self._db.fetch_one(
-            "SELECT 1 FROM users WHERE username = ?",
-            (username,)
-        )
+        row = self._db.fetch_one(_SQL_USER_EXISTS, (username,))
         return row is not None
     
     def register_user(self, username: str, password: str, role: str = "user") -> Tuple[bool, str]:
@@ -122,23 +297,27 @@ class AuthManager:
         if not is_valid:
             return False, error_msg
         
-        # Check if user exists
-        if self.user_exists(username):
-            return False, "Username already exists"
-        
         try:
             # Hash password
             password_hash = self._hasher.hash_password(password)
             
-            # Insert into database
-            self._db.execute_query(
-                "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            # Insert into database; the UNIQUE username constraint replaces a
+            # separate existence check, so there is no race between the two
+            cursor = self._db.execute_query(
+                _SQL_INSERT_USER,
                 (username, password_hash, role)
             )
             
-            return True, f"User '{username}' registered successfully"
+            if cursor.rowcount == 0:
+                return False, "Username already exists"
         except Exception as e:
             return False, f"Registration failed: {str(e)}"
+        
+        # Outside the try: the user row is committed by now, so a failure
+        # here must not be reported as a failed registration
+        self.clear_login_cache(username)
+        
+        return True, f"User '{username}' registered successfully"
     
     def login_user(self, username: str, password: str) -> Optional[User]:
         """
@@ -154,30 +333,78 @@ class AuthManager:
         if not username or not password:
             return None
         
+        # Recent successful login with the same credentials: skip bcrypt
+        cache_key = self._login_cache_key(username, password)
+        with self._login_cache_lock:
+            cached = self._login_cache.get(cache_key)
+            if cached is not None and cached[1] <= time.monotonic():
+                self._login_cache.pop(cache_key, None)
+                cached = None
+        if cached is not None:
+            return User(*cached[0])
+        
         try:
             # Fetch user from database
-            row = self._db.fetch_one(
-                "SELECT id, username, password_hash, role FROM users WHERE username = ?",
-                (username,)
-            )
+            row = self._db.fetch_one(_SQL_SELECT_USER, (username,))
             
             if row is None:
+                # Spend the same bcrypt time as a real check before failing
+                self._hasher.check_password(password, self._dummy_hash)
+                return None
+            
+            # Verify against the stored hash first; failed attempts never
+            # need a User object
+            if not self._hasher.check_password(password, row['password_hash']):
                 return None
             
-            # Create User object and verify password
-            user = User(
+            # Upgrade hashes created with a weaker cost factor
+            password_hash = row['password_hash']
+            if self._hasher.needs_rehash(password_hash):
+                password_hash = self._hasher.hash_password(password)
+                self._db.execute_query(_SQL_UPDATE_HASH, (password_hash, row['id']))
+            
+            fields = (row['id'], row['username'], password_hash, row['role'])
+            with self._login_cache_lock:
+                self._login_cache[cache_key] = (fields, time.monotonic() + LOGIN_CACHE_TTL_SECONDS)
+                if len(self._login_cache) > _LOGIN_CACHE_MAX_ENTRIES:
+                    self._login_cache.popitem(last=False)
+            
+            return User(
                 user_id=row['id'],
                 username=row['username'],
-                password_hash=row['password_hash'],
+                password_hash=password_hash,
                 role=row['role']
             )
-            
-            # Verify password using the User object's method
-            if user.verify_password(password, self._hasher):
-                return user
-            else:
-                return None
                 
         except Exception as e:
             print(f"Authentication error: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    async def login_user_async(self, username: str, password: str) -> Optional[User]:
+        """
+        Authenticate a user without blocking the event loop.
+        
+        Runs login_user() on a bcrypt pool worker, which hashes inline, so
+        each login holds a single thread. At most ASYNC_LOGIN_LIMIT run at
+        a time per event loop; further calls wait for a free slot.
+        
+        Args:
+            username: Username to authenticate
+            password: Plain text password
+            
+        Returns:
+            Optional[User]: User object if authentication successful, None otherwise
+        """
+        loop = asyncio.get_running_loop()
+        with self._login_slots_lock:
+            slots = self._login_slots.get(loop)
+            if slots is None:
+                # A bound semaphore references its loop, so drop the entries
+                # of finished loops here rather than waiting for them to be
+                # collected
+                for old in [l for l in self._login_slots if l.is_closed()]:
+                    del self._login_slots[old]
+                slots = self._login_slots[loop] = asyncio.Semaphore(ASYNC_LOGIN_LIMIT)
+        
+        async with slots:
+            return await loop.run_in_executor(_BCRYPT_POOL, self.login_user, username, password)
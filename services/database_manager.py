@@ -1,10 +1,62 @@
 """Database Manager service class."""
 
+import queue
 import sqlite3
-from typing import Any, Iterable, Optional, List
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from typing import Any, Iterable, Iterator, Optional, List
 from pathlib import Path
 
 
+# Absolute path to the platform database, resolved once so connections do
+# not depend on the working directory Streamlit was started from
+DB_PATH_STR = str((Path(__file__).resolve().parent.parent / "DATA" / "intelligence_platform.db"))
+
+
+# Indexes matching the columns the dashboards group, filter and sort on
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_incidents_status_sev ON cyber_incidents(status, severity)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_ts ON cyber_incidents(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_category ON cyber_incidents(category)",
+    # Lookups by ID, and the filtered lists, which are all sorted newest ID first
+    "CREATE INDEX IF NOT EXISTS idx_incidents_id ON cyber_incidents(incident_id)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_sev_id ON cyber_incidents(severity, incident_id)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_status_id ON cyber_incidents(status, incident_id)",
+    # Covers the ticket statistics: both (status, priority) aggregates read
+    # only this index, never the table
+    "CREATE INDEX IF NOT EXISTS idx_tickets_stats ON it_tickets(status, priority, resolution_time_hours)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_created ON it_tickets(created_at)",
+    # Walked in order by the per-day ticket counts, so GROUP BY date(...)
+    # needs no temporary sort
+    "CREATE INDEX IF NOT EXISTS idx_tickets_created_date ON it_tickets(date(created_at))",
+    # Ticket lookups by ID and the filtered lists, newest ID first
+    "CREATE INDEX IF NOT EXISTS idx_tickets_id ON it_tickets(ticket_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_status_id ON it_tickets(status, ticket_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_priority_id ON it_tickets(priority, ticket_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_assignee_id ON it_tickets(assigned_to, ticket_id)",
+    "CREATE INDEX IF NOT EXISTS idx_datasets_id ON datasets_metadata(dataset_id)",
+    "CREATE INDEX IF NOT EXISTS idx_datasets_uploader_id ON datasets_metadata(uploaded_by, dataset_id)",
+    # The create paths number new rows with MAX(CAST(<id> AS INTEGER)) + 1;
+    # indexing that expression turns the MAX into a single index seek
+    "CREATE INDEX IF NOT EXISTS idx_incidents_num_id ON cyber_incidents(CAST(incident_id AS INTEGER))",
+    "CREATE INDEX IF NOT EXISTS idx_datasets_num_id ON datasets_metadata(CAST(dataset_id AS INTEGER))",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_num_id ON it_tickets(CAST(ticket_id AS INTEGER))",
+)
+
+# Migration: indexes earlier versions created that an entry in _INDEXES now
+# replaces. ensure_indexes() drops them so writes stop maintaining them.
+_SUPERSEDED_INDEXES = (
+    # A prefix of idx_tickets_stats, so the planner never needs it
+    "idx_tickets_status_priority",
+)
+
+# Most read-only connections kept open at once. Reads run on these in
+# parallel (WAL allows that alongside a writer); a reader that finds all of
+# them busy waits for one to be returned.
+READ_POOL_SIZE = 4
+
+
 class DatabaseManager:
     """Handles SQLite database connections and queries."""
     
@@ -17,18 +69,163 @@ class DatabaseManager:
         """
         self._db_path = Path(db_path)
         self._connection: Optional[sqlite3.Connection] = None
+        # Guards the write connection when one manager serves several
+        # Streamlit script threads (see services/db_singleton.py)
+        self._lock = threading.RLock()
+        # journal_mode=WAL is stored in the database file, so it only needs
+        # setting on the first connect; the other pragmas are per connection
+        self._initialized = False
+        # Commits made on the write connection, so callers can tell that data
+        # changed even when an UPDATE leaves row counts and IDs as they were
+        self._commit_count = 0
+        # Nesting depth of transaction() blocks; writes commit only at depth 0
+        self._tx_depth = 0
+        # Thread running the open transaction() block; its reads go through
+        # the write connection so they see the block's uncommitted writes
+        self._tx_thread: Optional[int] = None
+        # Idle read connections, and how many have been opened in total
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        # Guards _reader_count; kept apart from _lock so reads never wait
+        # for a writer's transaction
+        self._pool_lock = threading.Lock()
+    
+    def _open_connection(self, isolation_level: Optional[str]) -> sqlite3.Connection:
+        """
+        Open a connection with the per-connection pragmas applied.
+        
+        Args:
+            isolation_level: sqlite3 isolation level for the connection
+            
+        Returns:
+            sqlite3.Connection: New connection
+        """
+        connection = sqlite3.connect(
+            str(self._db_path),
+            timeout=5.0,
+            isolation_level=isolation_level,
+            check_same_thread=False,
+            # Compiled statements are reused by SQL text; the services
+            # issue a few dozen distinct queries, well under this size
+            cached_statements=256
+        )
+        connection.row_factory = sqlite3.Row  # Enable column access by name
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA temp_store=MEMORY")   # sorts/GROUP BY temp tables
+        connection.execute("PRAGMA mmap_size=268435456")  # read pages via 256 MiB mmap
+        connection.execute("PRAGMA cache_size=-65536")    # 64 MiB page cache
+        return connection
     
     def connect(self) -> None:
         """Establish database connection."""
-        if self._connection is None:
-            self._connection = sqlite3.connect(str(self._db_path))
-            self._connection.row_factory = sqlite3.Row  # Enable column access by name
+        with self._lock:
+            if self._connection is None:
+                # Writes open with BEGIN IMMEDIATE so a writer takes the lock up
+                # front instead of failing to upgrade a read lock (SQLITE_BUSY);
+                # contended writers wait up to `timeout` seconds
+                self._connection = self._open_connection("IMMEDIATE")
+                if not self._initialized:
+                    # WAL lets readers (logins, dashboards) run alongside a writer
+                    self._connection.execute("PRAGMA journal_mode=WAL")
+                    self._initialized = True
+    
+    @contextmanager
+    def _read_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for a read query.
+        
+        Reads made inside this thread's transaction() block use the write
+        connection; all others take a pooled read connection, opening one
+        if fewer than READ_POOL_SIZE exist.
+        
+        Yields:
+            sqlite3.Connection: Connection to run the query on
+        """
+        if self._tx_depth and self._tx_thread == threading.get_ident():
+            with self._lock:
+                yield self._connection
+            return
+        
+        try:
+            connection = self._readers.get_nowait()
+        except queue.Empty:
+            if not self._initialized:
+                self.connect()  # switches the database to WAL first
+            with self._pool_lock:
+                opened = self._reader_count < READ_POOL_SIZE
+                if opened:
+                    self._reader_count += 1
+            if opened:
+                try:
+                    connection = self._open_connection(None)
+                except BaseException:
+                    with self._pool_lock:
+                        self._reader_count -= 1
+                    raise
+            else:
+                connection = self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+    
+    def _commit(self) -> None:
+        """Commit the write connection and count the commit. Call with _lock held."""
+        self._connection.commit()
+        self._commit_count += 1
+    
+    def get_commit_count(self) -> int:
+        """
+        Get the number of writes committed through this manager.
+        
+        Returns:
+            int: Commits since the manager was created
+        """
+        return self._commit_count
+    
+    def ensure_indexes(self) -> None:
+        """
+        Create the dashboard indexes if missing and drop superseded ones.
+        
+        Planner statistics are refreshed only when an index was created, so
+        the usual startup, with every index in place, skips the ANALYZE scan.
+        """
+        with self._lock:
+            if self._connection is None:
+                self.connect()
+            
+            before = self._index_names()
+            for name in _SUPERSEDED_INDEXES:
+                if name in before:
+                    self._connection.execute(f"DROP INDEX {name}")
+            for statement in _INDEXES:
+                self._connection.execute(statement)
+            if self._index_names() - before:
+                # Let the query planner see the new indexes' selectivity
+                self._connection.execute("ANALYZE")
+            self._connection.commit()
+    
+    def _index_names(self) -> set:
+        """Get the names of the indexes in the database. Call with _lock held."""
+        rows = self._connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+        return {row[0] for row in rows}
     
     def close(self) -> None:
         """Close database connection."""
-        if self._connection is not None:
-            self._connection.close()
-            self._connection = None
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            # Read connections borrowed right now rejoin the pool when released
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+                with self._pool_lock:
+                    self._reader_count -= 1
     
     def execute_query(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
         """
@@ -41,13 +238,92 @@ class DatabaseManager:
         Returns:
             sqlite3.Cursor: Cursor object
         """
-        if self._connection is None:
-            self.connect()
+        with self._lock:
+            if self._connection is None:
+                self.connect()
+            
+            cursor = self._connection.execute(sql, tuple(params))
+            if self._tx_depth == 0:
+                self._commit()
+            return cursor
+    
+    def execute_many(self, sql: str, seq_of_params: Iterable[Iterable[Any]]) -> sqlite3.Cursor:
+        """
+        Execute a write query once per parameter set, with a single commit.
         
-        cursor = self._connection.cursor()
-        cursor.execute(sql, tuple(params))
-        self._connection.commit()
-        return cursor
+        Args:
+            sql: SQL query string
+            seq_of_params: One parameter sequence per execution
+            
+        Returns:
+            sqlite3.Cursor: Cursor object
+        """
+        with self._lock:
+            if self._connection is None:
+                self.connect()
+            
+            cursor = self._connection.executemany(
+                sql, (tuple(params) for params in seq_of_params)
+            )
+            if self._tx_depth == 0:
+                self._commit()
+            return cursor
+    
+    def execute_returning(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        """
+        Execute a write query with a RETURNING clause and fetch its rows.
+        
+        The rows are read before committing; SQLite refuses to commit while
+        a RETURNING statement still has rows pending.
+        
+        Args:
+            sql: SQL query string ending in RETURNING ...
+            params: Query parameters
+            
+        Returns:
+            List[sqlite3.Row]: Rows produced by the RETURNING clause
+        """
+        with self._lock:
+            if self._connection is None:
+                self.connect()
+            
+            rows = self._connection.execute(sql, tuple(params)).fetchall()
+            if self._tx_depth == 0:
+                self._commit()
+            return rows
+    
+    @contextmanager
+    def transaction(self) -> Iterator["DatabaseManager"]:
+        """
+        Group several writes into one transaction with a single commit.
+        
+        Inside the block execute_query() and execute_many() do not commit;
+        nested blocks join the outermost one. The block is rolled back if
+        it raises. Other threads wait on the lock until it finishes.
+        
+        Yields:
+            DatabaseManager: This manager
+        """
+        with self._lock:
+            if self._connection is None:
+                self.connect()
+            
+            if self._tx_depth == 0 and not self._connection.in_transaction:
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._tx_depth += 1
+            self._tx_thread = threading.get_ident()
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self._tx_thread = None
+                    self._connection.rollback()
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self._tx_thread = None
+                self._commit()
     
     def fetch_one(self, sql: str, params: Iterable[Any] = ()) -> Optional[sqlite3.Row]:
         """
@@ -60,12 +336,8 @@ class DatabaseManager:
         Returns:
             Optional[sqlite3.Row]: Single row or None
         """
-        if self._connection is None:
-            self.connect()
-        
-        cursor = self._connection.cursor()
-        cursor.execute(sql, tuple(params))
-        return cursor.fetchone()
+        with self._read_connection() as connection:
+            return connection.execute(sql, tuple(params)).fetchone()
     
     def fetch_all(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
         """
@@ -78,12 +350,95 @@ class DatabaseManager:
         Returns:
             List[sqlite3.Row]: List of rows
         """
-        if self._connection is None:
-            self.connect()
+        with self._read_connection() as connection:
+            return connection.execute(sql, tuple(params)).fetchall()
+    
+    def fetch_tuples(self, sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        """
+        Fetch all rows as plain tuples.
         
-        cursor = self._connection.cursor()
-        cursor.execute(sql, tuple(params))
-        return cursor.fetchall()
+        Skips the sqlite3.Row wrapper for paths that read columns by
+        position, such as building model objects from every row.
+        
+        Args:
+            sql: SQL query string
+            params: Query parameters
+            
+        Returns:
+            List[tuple]: List of rows
+        """
+        with self._read_connection() as connection:
+            # Overrides the connection's row factory for this cursor only
+            cursor = connection.cursor()
+            cursor.row_factory = None
+            return cursor.execute(sql, tuple(params)).fetchall()
+    
+    def fetch_as(self, sql: str, params: Iterable[Any], wrap) -> List[Any]:
+        """
+        Fetch all rows, each one passed through `wrap` as it is read.
+        
+        The callable becomes the cursor's row factory, so each result is
+        built inside sqlite3's fetch loop and no list of raw tuples is kept
+        alongside the wrapped rows.
+        
+        Args:
+            sql: SQL query string
+            params: Query parameters
+            wrap: Callable taking one row tuple, e.g. a tuple subclass
+            
+        Returns:
+            List[Any]: One wrapped object per row
+        """
+        with self._read_connection() as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = lambda _cursor, row: wrap(row)
+            return cursor.execute(sql, tuple(params)).fetchall()
+    
+    def fetch_iter(self, sql: str, params: Iterable[Any] = (),
+                   batch_size: int = 512) -> Iterator[sqlite3.Row]:
+        """
+        Yield rows as they are read, instead of loading them all at once.
+        
+        Rows are fetched in batches of `batch_size`. The generator keeps a
+        read connection until it is exhausted or closed.
+        
+        Args:
+            sql: SQL query string
+            params: Query parameters
+            batch_size: Rows to fetch per batch
+            
+        Yields:
+            sqlite3.Row: One row at a time
+        """
+        with self._read_connection() as connection:
+            cursor = connection.execute(sql, tuple(params))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+    
+    def read_dataframe(self, sql: str, params: Iterable[Any] = (),
+                       parse_dates: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Fetch query results straight into a DataFrame.
+        
+        Columns use pyarrow-backed dtypes, so st.dataframe can hand them to
+        the frontend without re-encoding Python objects.
+        
+        Args:
+            sql: SQL query string
+            params: Query parameters
+            parse_dates: Columns to convert to datetimes while reading
+            
+        Returns:
+            pd.DataFrame: Query results, one column per selected field
+        """
+        with self._read_connection() as connection:
+            return pd.read_sql_query(
+                sql, connection, params=tuple(params),
+                parse_dates=parse_dates, dtype_backend="pyarrow"
+            )
     
     def __enter__(self):
         """Context manager entry."""
@@ -1,10 +1,44 @@
 """Dataset Service for managing data science datasets."""
 
-from typing import List, Optional
-from models.dataset import Dataset
+import time
+import pandas as pd
+from typing import Iterable, Iterator, List, Optional
+from models.dataset import Dataset, DatasetView
 from services.database_manager import DatabaseManager
 
 
+# Queries, built once at import so every call hands the statement cache the
+# same SQL text
+_SQL_DATA_VERSION = "SELECT MAX(id), COUNT(*) FROM datasets_metadata"
+
+# Columns in Dataset constructor order, so rows unpack positionally
+_SQL_SELECT_DATASETS = """SELECT dataset_id, name, rows, columns, uploaded_by, upload_date
+   FROM datasets_metadata"""
+_SQL_ALL_DATASETS = _SQL_SELECT_DATASETS + " ORDER BY dataset_id DESC"
+_SQL_DATASET_BY_ID = _SQL_SELECT_DATASETS + " WHERE dataset_id = ?"
+# Paged lists; LIMIT -1 is SQLite for "no limit"
+_SQL_ALL_DATASETS_PAGE = _SQL_ALL_DATASETS + " LIMIT ? OFFSET ?"
+_SQL_DATASETS_BY_UPLOADER_PAGE = (_SQL_SELECT_DATASETS
+    + " WHERE uploaded_by = ? ORDER BY dataset_id DESC LIMIT ? OFFSET ?")
+
+_SQL_UPLOADERS = """SELECT DISTINCT uploaded_by FROM datasets_metadata 
+   WHERE uploaded_by IS NOT NULL AND uploaded_by != '' 
+   ORDER BY uploaded_by"""
+_SQL_STATISTICS = """SELECT COUNT(*) as dataset_count,
+          SUM(rows) as total_rows,
+          AVG(columns) as avg_columns
+   FROM datasets_metadata"""
+
+# Insert one dataset, numbering it in the same statement (dataset_id is
+# stored as TEXT, so cast before taking the MAX)
+_SQL_INSERT_DATASET = """INSERT INTO datasets_metadata 
+   (dataset_id, name, rows, columns, uploaded_by, upload_date)
+   SELECT COALESCE(MAX(CAST(dataset_id AS INTEGER)), 0) + 1, ?, ?, ?, ?, ?
+   FROM datasets_metadata"""
+_SQL_CREATE_DATASET = _SQL_INSERT_DATASET + " RETURNING CAST(dataset_id AS INTEGER)"
+_SQL_DELETE_DATASET = "DELETE FROM datasets_metadata WHERE dataset_id = ?"
+
+
 class DatasetService:
     """Service class for managing datasets."""
     
@@ -17,31 +51,72 @@ class DatasetService:
         """
         self._db = db
     
-    def get_all_datasets(self) -> List[Dataset]:
+    def get_data_version(self) -> tuple:
         """
-        Retrieve all datasets.
+        Get a cheap stamp that changes when datasets are added or removed,
+        and after any write committed through this app's DatabaseManager.
+        
+        Updates made by other programs leave it unchanged.
         
         Returns:
-            List[Dataset]: List of all datasets
+            tuple: (highest row id, row count, commit count)
         """
-        rows = self._db.fetch_all(
-            """SELECT dataset_id, name, rows, columns, uploaded_by, upload_date
-               FROM datasets_metadata ORDER BY dataset_id DESC"""
-        )
+        row = self._db.fetch_one(_SQL_DATA_VERSION)
+        return (*row, self._db.get_commit_count())
+    
+    def _query_datasets(self, sql: str, params: tuple = (),
+                        limit: Optional[int] = None, offset: int = 0) -> List[DatasetView]:
+        """
+        Run a paged dataset query and wrap the result rows.
+        
+        Paging is done by SQLite: with the ORDER BY served from an index it
+        stops reading once `limit` rows past `offset` are found.
+        
+        Args:
+            sql: One of the *_PAGE queries, ending in LIMIT ? OFFSET ?
+            params: Parameters before the LIMIT and OFFSET
+            limit: Maximum number of rows to return, or None for all
+            offset: Number of rows to skip first
+            
+        Returns:
+            List[DatasetView]: Matching datasets
+        """
+        rows = self._db.fetch_tuples(sql, (*params, -1 if limit is None else limit, offset))
+        return [DatasetView(row) for row in rows]
+    
+    def get_all_datasets(self, limit: Optional[int] = None,
+                         offset: int = 0) -> List[DatasetView]:
+        """
+        Retrieve all datasets, newest first.
+        
+        Args:
+            limit: Maximum number of datasets to return, or None for all
+            offset: Number of datasets to skip, for paging
+            
+        Returns:
+            List[DatasetView]: List of all datasets
+        """
+        return self._query_datasets(_SQL_ALL_DATASETS_PAGE, (), limit, offset)
+    
+    def iter_all_datasets(self) -> Iterator[DatasetView]:
+        """
+        Iterate over all datasets, newest first, reading rows in batches.
         
-        datasets = []
+        Yields:
+            DatasetView: One dataset at a time
+        """
+        rows = self._db.fetch_iter(_SQL_ALL_DATASETS)
         for row in rows:
-            dataset = Dataset(
-                dataset_id=row['dataset_id'],
-                name=row['name'],
-                rows=row['rows'],
-                columns=row['columns'],
-                uploaded_by=row['uploaded_by'],
-                upload_date=row['upload_date']
-            )
-            datasets.append(dataset)
-        
-        return datasets
+            yield DatasetView(row)
+    
+    def get_all_df(self) -> pd.DataFrame:
+        """
+        Get all datasets as a DataFrame for table views.
+        
+        Returns:
+            pd.DataFrame: Dataset rows, newest first
+        """
+        return self._db.read_dataframe(_SQL_ALL_DATASETS)
     
     def get_dataset_by_id(self, dataset_id: int) -> Optional[Dataset]:
         """
@@ -53,52 +128,36 @@ class DatasetService:
         Returns:
             Optional[Dataset]: Dataset object or None
         """
-        row = self._db.fetch_one(
-            """SELECT dataset_id, name, rows, columns, uploaded_by, upload_date
-               FROM datasets_metadata WHERE dataset_id = ?""",
-            (dataset_id,)
-        )
+        row = self._db.fetch_one(_SQL_DATASET_BY_ID, (dataset_id,))
         
         if row:
-            return Dataset(
-                dataset_id=row['dataset_id'],
-                name=row['name'],
-                rows=row['rows'],
-                columns=row['columns'],
-                uploaded_by=row['uploaded_by'],
-                upload_date=row['upload_date']
-            )
+            return Dataset(*row)
         return None
     
-    def get_datasets_by_uploader(self, uploaded_by: str) -> List[Dataset]:
+    def get_datasets_by_uploader(self, uploaded_by: str, limit: Optional[int] = None,
+                                 offset: int = 0) -> List[DatasetView]:
         """
-        Get datasets filtered by uploader.
+        Get datasets filtered by uploader, newest first.
         
         Args:
             uploaded_by: Username of uploader
+            limit: Maximum number of datasets to return, or None for all
+            offset: Number of datasets to skip, for paging
             
         Returns:
-            List[Dataset]: Filtered datasets
+            List[DatasetView]: Filtered datasets
         """
-        rows = self._db.fetch_all(
-            """SELECT dataset_id, name, rows, columns, uploaded_by, upload_date
-               FROM datasets_metadata WHERE uploaded_by = ? ORDER BY dataset_id DESC""",
-            (uploaded_by,)
-        )
+        return self._query_datasets(_SQL_DATASETS_BY_UPLOADER_PAGE, (uploaded_by,), limit, offset)
+    
+    def get_uploaders(self) -> List[str]:
+        """
+        Get the distinct users who have uploaded datasets.
         
-        datasets = []
-        for row in rows:
-            dataset = Dataset(
-                dataset_id=row['dataset_id'],
-                name=row['name'],
-                rows=row['rows'],
-                columns=row['columns'],
-                uploaded_by=row['uploaded_by'],
-                upload_date=row['upload_date']
-            )
-            datasets.append(dataset)
-        
-        return datasets
+        Returns:
+            List[str]: Uploader names in alphabetical order
+        """
+        rows = self._db.fetch_tuples(_SQL_UPLOADERS)
+        return [row[0] for row in rows]
     
     def create_dataset(self, name: str, rows: int, columns: int,
                       uploaded_by: str) -> int:
@@ -114,25 +173,31 @@ class DatasetService:
         Returns:
             int: ID of newly created dataset
         """
-        from datetime import datetime
+        upload_date = time.strftime('%Y-%m-%d')
         
-        # Get next dataset ID
-        max_row = self._db.fetch_one(
-            "SELECT MAX(dataset_id) as max_id FROM datasets_metadata"
+        created = self._db.execute_returning(
+            _SQL_CREATE_DATASET,
+            (name, rows, columns, uploaded_by, upload_date)
         )
-        next_id = (max_row['max_id'] or 0) + 1
-        
-        upload_date = datetime.now().strftime('%Y-%m-%d')
+        return created[0][0]
+    
+    def create_datasets(self, datasets: Iterable[tuple]) -> int:
+        """
+        Create many dataset records in one transaction.
         
-        # Insert dataset
-        self._db.execute_query(
-            """INSERT INTO datasets_metadata 
-               (dataset_id, name, rows, columns, uploaded_by, upload_date)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (next_id, name, rows, columns, uploaded_by, upload_date)
+        Args:
+            datasets: (name, rows, columns, uploaded_by) tuples
+            
+        Returns:
+            int: Number of datasets created
+        """
+        upload_date = time.strftime('%Y-%m-%d')
+        cursor = self._db.execute_many(
+            _SQL_INSERT_DATASET,
+            ((name, rows, columns, uploaded_by, upload_date)
+             for name, rows, columns, uploaded_by in datasets)
         )
-        
-        return next_id
+        return cursor.rowcount
     
     def delete_dataset(self, dataset_id: int) -> bool:
         """
@@ -144,10 +209,7 @@ class DatasetService:
         Returns:
             bool: True if deletion successful
         """
-        cursor = self._db.execute_query(
-            "DELETE FROM datasets_metadata WHERE dataset_id = ?",
-            (dataset_id,)
-        )
+        cursor = self._db.execute_query(_SQL_DELETE_DATASET, (dataset_id,))
         return cursor.rowcount > 0
     
     def get_total_records(self) -> int:
@@ -157,10 +219,8 @@ class DatasetService:
         Returns:
             int: Total records
         """
-        row = self._db.fetch_one(
-            "SELECT SUM(rows) as total FROM datasets_metadata"
-        )
-        return row['total'] or 0
+        # The statistics query already computes this SUM
+        return self.get_dataset_statistics()['total_rows']
     
     def get_dataset_statistics(self) -> dict:
         """
@@ -169,13 +229,7 @@ class DatasetService:
         Returns:
             dict: Statistics including count, total rows, avg columns
         """
-        row = self._db.fetch_one(
-            """SELECT 
-                COUNT(*) as dataset_count,
-                SUM(rows) as total_rows,
-                AVG(columns) as avg_columns
-               FROM datasets_metadata"""
-        )
+        row = self._db.fetch_one(_SQL_STATISTICS)
         
         return {
             'dataset_count': row['dataset_count'],
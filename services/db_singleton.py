@@ -0,0 +1,25 @@
+"""Process-wide DatabaseManager shared by Home.py and the pages."""
+
+import atexit
+import streamlit as st
+from services.database_manager import DatabaseManager, DB_PATH_STR
+
+
+@st.cache_resource(show_spinner=False)
+def get_db() -> DatabaseManager:
+    """
+    Get the shared DatabaseManager.
+    
+    Created on first use and reused by every rerun and session, so pages
+    no longer open and close a connection per interaction. Missing indexes
+    are created on first use, and the connection is closed when the server
+    process exits.
+    
+    Returns:
+        DatabaseManager: Shared, connected manager
+    """
+    db = DatabaseManager(DB_PATH_STR)
+    db.connect()
+    db.ensure_indexes()
+    atexit.register(db.close)
+    return db
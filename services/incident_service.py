@@ -1,10 +1,75 @@
 """Security Incident Service for managing cybersecurity incidents."""
 
-from typing import List, Optional
-from models.security_incident import SecurityIncident
+import time
+import pandas as pd
+from typing import Iterable, Iterator, List, Optional
+from models.security_incident import IncidentView, SecurityIncident
 from services.database_manager import DatabaseManager
 
 
+# Severity levels in ascending order, for sorting display tables and charts.
+# Aggregate on the plain strings first and cast afterwards: grouping on a
+# categorical column can be much slower than grouping on objects.
+SEVERITY_CAT = pd.CategoricalDtype(["Low", "Medium", "High", "Critical"], ordered=True)
+
+# New incidents' timestamps, local time in the same layout as the stored rows.
+# time.strftime formats straight from the clock, with no datetime object.
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Queries, built once at import. Each method passes the same string object
+# on every call, so the connection's statement cache (keyed on the SQL text)
+# finds its compiled statement without rebuilding the text.
+_SQL_DATA_VERSION = "SELECT MAX(id), COUNT(*) FROM cyber_incidents"
+
+# Columns in SecurityIncident constructor order, so rows unpack positionally
+_SQL_SELECT_INCIDENTS = """SELECT incident_id, category, severity, status, description, timestamp,
+          reported_by
+   FROM cyber_incidents"""
+_SQL_ALL_INCIDENTS = _SQL_SELECT_INCIDENTS + " ORDER BY incident_id DESC"
+_SQL_INCIDENT_BY_ID = _SQL_SELECT_INCIDENTS + " WHERE incident_id = ?"
+# Paged lists; LIMIT -1 is SQLite for "no limit"
+_SQL_ALL_INCIDENTS_PAGE = _SQL_ALL_INCIDENTS + " LIMIT ? OFFSET ?"
+_SQL_INCIDENTS_BY_SEVERITY_PAGE = (_SQL_SELECT_INCIDENTS
+    + " WHERE severity = ? ORDER BY incident_id DESC LIMIT ? OFFSET ?")
+_SQL_INCIDENTS_BY_STATUS_PAGE = (_SQL_SELECT_INCIDENTS
+    + " WHERE status = ? ORDER BY incident_id DESC LIMIT ? OFFSET ?")
+
+_SQL_RECENT_DF = """SELECT incident_id, category, severity, status,
+          substr(description, 1, ?) || '...' AS description, timestamp
+   FROM cyber_incidents ORDER BY incident_id DESC LIMIT ?"""
+_SQL_DAILY_COUNTS = """SELECT date(timestamp) AS date, COUNT(*) AS count
+   FROM cyber_incidents
+   WHERE date(timestamp) IS NOT NULL
+   GROUP BY 1 ORDER BY 1"""
+_SQL_RECENT_SUMMARIES = """SELECT incident_id, category, severity
+   FROM cyber_incidents ORDER BY incident_id DESC LIMIT ?"""
+
+# Insert one incident, numbering it inside the statement itself: there is no
+# separate MAX round-trip and concurrent creates cannot pick the same ID.
+# incident_id is a TEXT column, hence the CAST.
+_SQL_INSERT_INCIDENT = """INSERT INTO cyber_incidents 
+   (incident_id, timestamp, category, severity, status, description)
+   SELECT COALESCE(MAX(CAST(incident_id AS INTEGER)), 1000) + 1, ?, ?, ?, 'Open', ?
+   FROM cyber_incidents"""
+# Single creates get the new ID back from the same statement
+_SQL_CREATE_INCIDENT = _SQL_INSERT_INCIDENT + " RETURNING CAST(incident_id AS INTEGER)"
+_SQL_UPDATE_STATUS = "UPDATE cyber_incidents SET status = ? WHERE incident_id = ?"
+_SQL_DELETE_INCIDENT = "DELETE FROM cyber_incidents WHERE incident_id = ?"
+
+_SQL_COUNT_BY_CATEGORY = """SELECT category, COUNT(*) as count 
+   FROM cyber_incidents 
+   GROUP BY category 
+   ORDER BY count DESC"""
+_SQL_STATUS_SEVERITY_COUNTS = """SELECT status, severity, COUNT(*) as count 
+   FROM cyber_incidents 
+   GROUP BY status, severity"""
+_SQL_HIGH_SEVERITY_BY_STATUS = """SELECT status, COUNT(*) as count 
+   FROM cyber_incidents 
+   WHERE severity = 'High' 
+   GROUP BY status 
+   ORDER BY count DESC"""
+
+
 class IncidentService:
     """Service class for managing security incidents."""
     
@@ -17,31 +82,107 @@ class IncidentService:
         """
         self._db = db
     
-    def get_all_incidents(self) -> List[SecurityIncident]:
+    def get_data_version(self) -> tuple:
         """
-        Retrieve all security incidents.
+        Get a cheap stamp that changes when incidents are added or removed,
+        and after any write committed through this app's DatabaseManager.
+        
+        Updates made by other programs leave it unchanged.
         
         Returns:
-            List[SecurityIncident]: List of all incidents
+            tuple: (highest row id, row count, commit count)
         """
-        rows = self._db.fetch_all(
-            """SELECT incident_id, timestamp, category, severity, status, description 
-               FROM cyber_incidents ORDER BY incident_id DESC"""
-        )
+        row = self._db.fetch_one(_SQL_DATA_VERSION)
+        return (*row, self._db.get_commit_count())
+    
+    def _query_incidents(self, sql: str, params: tuple = (),
+                         limit: Optional[int] = None, offset: int = 0) -> List[IncidentView]:
+        """
+        Run a paged incident query and wrap the result rows.
+        
+        Paging is done by SQLite: with the ORDER BY served from an index it
+        stops reading once `limit` rows past `offset` are found.
+        
+        Args:
+            sql: One of the *_PAGE queries, ending in LIMIT ? OFFSET ?
+            params: Parameters before the LIMIT and OFFSET
+            limit: Maximum number of rows to return, or None for all
+            offset: Number of rows to skip first
+            
+        Returns:
+            List[IncidentView]: Matching incidents
+        """
+        rows = self._db.fetch_tuples(sql, (*params, -1 if limit is None else limit, offset))
+        return [IncidentView(row) for row in rows]
+    
+    def get_all_incidents(self, limit: Optional[int] = None,
+                          offset: int = 0) -> List[IncidentView]:
+        """
+        Retrieve all security incidents, newest first.
         
-        incidents = []
+        Args:
+            limit: Maximum number of incidents to return, or None for all
+            offset: Number of incidents to skip, for paging
+            
+        Returns:
+            List[IncidentView]: List of all incidents
+        """
+        return self._query_incidents(_SQL_ALL_INCIDENTS_PAGE, (), limit, offset)
+    
+    def iter_all_incidents(self) -> Iterator[IncidentView]:
+        """
+        Iterate over all security incidents, newest first.
+        
+        Rows are read in batches as the caller iterates, so the whole table
+        is never held in memory at once.
+        
+        Yields:
+            IncidentView: One incident at a time
+        """
+        rows = self._db.fetch_iter(_SQL_ALL_INCIDENTS)
         for row in rows:
-            incident = SecurityIncident(
-                incident_id=row['incident_id'],
-                incident_type=row['category'],
-                severity=row['severity'],
-                status=row['status'],
-                description=row['description'],
-                timestamp=row['timestamp']
-            )
-            incidents.append(incident)
-        
-        return incidents
+            yield IncidentView(row)
+    
+    def get_recent_df(self, limit: int = 20, description_length: int = 50) -> pd.DataFrame:
+        """
+        Get the most recent incidents as a DataFrame for table views.
+        
+        Descriptions are cut to `description_length` characters (plus "...")
+        in SQL, so long descriptions are never copied out of SQLite.
+        
+        Args:
+            limit: Maximum number of incidents to return
+            description_length: Characters of each description to keep
+            
+        Returns:
+            pd.DataFrame: Incident rows, newest first
+        """
+        return self._db.read_dataframe(_SQL_RECENT_DF, (description_length, limit))
+    
+    def get_daily_counts(self) -> pd.DataFrame:
+        """
+        Count incidents per day, aggregated in SQL.
+        
+        Timestamps SQLite cannot parse as a date are left out.
+        
+        Returns:
+            pd.DataFrame: 'date' and 'count' columns, oldest day first
+        """
+        return self._db.read_dataframe(_SQL_DAILY_COUNTS, parse_dates=['date'])
+    
+    def get_recent_summaries(self, limit: int = 10) -> List[tuple]:
+        """
+        Get id, category and severity of the most recent incidents.
+        
+        Enough to label a picker without building SecurityIncident objects.
+        
+        Args:
+            limit: Maximum number of incidents to return
+            
+        Returns:
+            List[tuple]: (incident_id, category, severity) rows, newest first
+        """
+        return self._db.fetch_tuples(_SQL_RECENT_SUMMARIES, (limit,))
     
     def get_incident_by_id(self, incident_id: int) -> Optional[SecurityIncident]:
         """
@@ -53,82 +194,41 @@ class IncidentService:
         Returns:
             Optional[SecurityIncident]: Incident object or None
         """
-        row = self._db.fetch_one(
-            """SELECT incident_id, timestamp, category, severity, status, description
-               FROM cyber_incidents WHERE incident_id = ?""",
-            (incident_id,)
-        )
+        row = self._db.fetch_one(_SQL_INCIDENT_BY_ID, (incident_id,))
         
         if row:
-            return SecurityIncident(
-                incident_id=row['incident_id'],
-                incident_type=row['category'],
-                severity=row['severity'],
-                status=row['status'],
-                description=row['description'],
-                timestamp=row['timestamp']
-            )
+            return SecurityIncident(*row)
         return None
     
-    def get_incidents_by_severity(self, severity: str) -> List[SecurityIncident]:
+    def get_incidents_by_severity(self, severity: str, limit: Optional[int] = None,
+                                  offset: int = 0) -> List[IncidentView]:
         """
-        Get incidents filtered by severity.
+        Get incidents filtered by severity, newest first.
         
         Args:
             severity: Severity level to filter by
+            limit: Maximum number of incidents to return, or None for all
+            offset: Number of incidents to skip, for paging
             
         Returns:
-            List[SecurityIncident]: Filtered incidents
+            List[IncidentView]: Filtered incidents
         """
-        rows = self._db.fetch_all(
-            """SELECT incident_id, timestamp, category, severity, status, description
-               FROM cyber_incidents WHERE severity = ? ORDER BY incident_id DESC""",
-            (severity,)
-        )
-        
-        incidents = []
-        for row in rows:
-            incident = SecurityIncident(
-                incident_id=row['incident_id'],
-                incident_type=row['category'],
-                severity=row['severity'],
-                status=row['status'],
-                description=row['description'],
-                timestamp=row['timestamp']
-            )
-            incidents.append(incident)
-        
-        return incidents
+        return self._query_incidents(_SQL_INCIDENTS_BY_SEVERITY_PAGE, (severity,), limit, offset)
     
-    def get_incidents_by_status(self, status: str) -> List[SecurityIncident]:
+    def get_incidents_by_status(self, status: str, limit: Optional[int] = None,
+                                offset: int = 0) -> List[IncidentView]:
         """
-        Get incidents filtered by status.
+        Get incidents filtered by status, newest first.
         
         Args:
             status: Status to filter by
+            limit: Maximum number of incidents to return, or None for all
+            offset: Number of incidents to skip, for paging
             
         Returns:
-            List[SecurityIncident]: Filtered incidents
+            List[IncidentView]: Filtered incidents
         """
-        rows = self._db.fetch_all(
-            """SELECT incident_id, timestamp, category, severity, status, description
-               FROM cyber_incidents WHERE status = ? ORDER BY incident_id DESC""",
-            (status,)
-        )
-        
-        incidents = []
-        for row in rows:
-            incident = SecurityIncident(
-                incident_id=row['incident_id'],
-                incident_type=row['category'],
-                severity=row['severity'],
-                status=row['status'],
-                description=row['description'],
-                timestamp=row['timestamp']
-            )
-            incidents.append(incident)
-        
-        return incidents
+        return self._query_incidents(_SQL_INCIDENTS_BY_STATUS_PAGE, (status,), limit, offset)
     
     def create_incident(self, incident_type: str, severity: str, 
                        description: str, reported_by: str = None) -> int:
@@ -144,23 +244,32 @@ class IncidentService:
         Returns:
             int: ID of newly created incident
         """
-        from datetime import datetime
-        
-        # Get next incident ID
-        max_row = self._db.fetch_one(
-            "SELECT MAX(incident_id) as max_id FROM cyber_incidents"
-        )
-        next_id = (max_row['max_id'] or 1000) + 1
-        
-        # Insert incident
-        self._db.execute_query(
-            """INSERT INTO cyber_incidents 
-               (incident_id, timestamp, category, severity, status, description)
-               VALUES (?, ?, ?, ?, 'Open', ?)""",
-            (next_id, datetime.now().isoformat(), incident_type, severity, description)
+        rows = self._db.execute_returning(
+            _SQL_CREATE_INCIDENT,
+            (time.strftime(_TIMESTAMP_FORMAT), incident_type, severity, description)
         )
+        return rows[0][0]
+    
+    def create_incidents(self, incidents: Iterable[tuple]) -> int:
+        """
+        Create many security incidents in one transaction.
         
-        return next_id
+        Each incident is numbered like create_incident(); all of them get
+        the same timestamp and a single commit.
+        
+        Args:
+            incidents: (incident_type, severity, description) tuples
+            
+        Returns:
+            int: Number of incidents created
+        """
+        timestamp = time.strftime(_TIMESTAMP_FORMAT)
+        cursor = self._db.execute_many(
+            _SQL_INSERT_INCIDENT,
+            ((timestamp, incident_type, severity, description)
+             for incident_type, severity, description in incidents)
+        )
+        return cursor.rowcount
     
     def update_incident_status(self, incident_id: int, new_status: str) -> bool:
         """
@@ -173,10 +282,7 @@ class IncidentService:
         Returns:
             bool: True if update successful
         """
-        cursor = self._db.execute_query(
-            "UPDATE cyber_incidents SET status = ? WHERE incident_id = ?",
-            (new_status, incident_id)
-        )
+        cursor = self._db.execute_query(_SQL_UPDATE_STATUS, (new_status, incident_id))
         return cursor.rowcount > 0
     
     def delete_incident(self, incident_id: int) -> bool:
@@ -189,10 +295,7 @@ class IncidentService:
         Returns:
             bool: True if deletion successful
         """
-        cursor = self._db.execute_query(
-            "DELETE FROM cyber_incidents WHERE incident_id = ?",
-            (incident_id,)
-        )
+        cursor = self._db.execute_query(_SQL_DELETE_INCIDENT, (incident_id,))
         return cursor.rowcount > 0
     
     def get_incident_count_by_category(self) -> dict:
@@ -202,15 +305,21 @@ class IncidentService:
         Returns:
             dict: Category counts
         """
-        rows = self._db.fetch_all(
-            """SELECT category, COUNT(*) as count 
-               FROM cyber_incidents 
-               GROUP BY category 
-               ORDER BY count DESC"""
-        )
+        rows = self._db.fetch_all(_SQL_COUNT_BY_CATEGORY)
         
         return {row['category']: row['count'] for row in rows}
     
+    def get_status_severity_counts(self) -> dict:
+        """
+        Get count of incidents for each (status, severity) pair.
+        
+        Returns:
+            dict: Counts keyed by (status, severity)
+        """
+        rows = self._db.fetch_all(_SQL_STATUS_SEVERITY_COUNTS)
+        
+        return {(row['status'], row['severity']): row['count'] for row in rows}
+    
     def get_high_severity_by_status(self) -> dict:
         """
         Get count of high severity incidents by status.
@@ -218,12 +327,6 @@ class IncidentService:
         Returns:
             dict: Status counts for high severity
         """
-        rows = self._db.fetch_all(
-            """SELECT status, COUNT(*) as count 
-               FROM cyber_incidents 
-               WHERE severity = 'High' 
-               GROUP BY status 
-               ORDER BY count DESC"""
-        )
+        rows = self._db.fetch_all(_SQL_HIGH_SEVERITY_BY_STATUS)
         
         return {row['status']: row['count'] for row in rows}
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Streamlit session-state helpers shared by Home.py and the pages."""
+
+import hashlib
+import hmac
+import os
+import secrets
+import time
+import streamlit as st
+
+# Keys every page expects in st.session_state, with their logged-out values
+_DEFAULTS = {
+    "logged_in": False,
+    "username": "",
+    "role": "",
+    "user_id": None,
+    "session_token": None,
+}
+
+# Key used to sign session tokens. Set SESSION_SECRET to share it between
+# server processes; otherwise a random key is generated per process.
+_SESSION_SECRET = os.getenv("SESSION_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+# How long a login stays valid without signing in again
+SESSION_TTL_SECONDS = 8 * 60 * 60
+
+
+def initialize_session_state() -> None:
+    """Initialize session state variables that are not set yet."""
+    for key, value in _DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+
+
+def _sign(user_id, expires: int) -> str:
+    """Return the HMAC-SHA256 signature for a user/expiry pair."""
+    message = f"{user_id}|{expires}".encode("utf-8")
+    return hmac.new(_SESSION_SECRET, message, hashlib.sha256).hexdigest()
+
+
+def issue_session_token(user_id) -> None:
+    """
+    Store a signed session token after a successful login.
+    
+    Pages check this token instead of re-running bcrypt, so a session pays
+    for one password hash no matter how many reruns follow.
+    
+    Args:
+        user_id: ID of the logged-in user
+    """
+    expires = int(time.time()) + SESSION_TTL_SECONDS
+    st.session_state.session_token = (_sign(user_id, expires), expires)
+
+
+def validate_session() -> bool:
+    """
+    Check that the current session holds a valid, unexpired login.
+    
+    Returns:
+        bool: True if the user is logged in with a genuine token
+    """
+    if not st.session_state.get("logged_in"):
+        return False
+    
+    token = st.session_state.get("session_token")
+    if not token:
+        return False
+    
+    signature, expires = token
+    if expires < time.time():
+        return False
+    
+    expected = _sign(st.session_state.get("user_id"), expires)
+    return hmac.compare_digest(signature, expected)
+
+
+def require_login() -> None:
+    """
+    Initialize session state and stop the page unless the user is logged in.
+    
+    Called at the top of every protected page, right after set_page_config.
+    """
+    initialize_session_state()
+    
+    if not validate_session():
+        st.error("🚫 You must be logged in to view this page")
+        if st.button("Go to Login"):
+            st.switch_page("Home.py")
+        st.stop()
@@ -1,10 +1,91 @@
 """IT Ticket Service for managing IT operations tickets."""
 
-from typing import List, Optional
-from models.it_ticket import ITTicket
+import pandas as pd
+from typing import Iterable, Iterator, List, Optional, Sequence
+from models.it_ticket import ITTicket, TicketView
 from services.database_manager import DatabaseManager
 
 
+# Priority levels in ascending order, for sorting display tables and charts
+PRIORITY_CAT = pd.CategoricalDtype(["Low", "Medium", "High", "Critical"], ordered=True)
+
+# IDs bound per IN (...) query; older SQLite builds allow at most 999
+# parameters in one statement
+_IDS_PER_QUERY = 999
+
+# Queries, built once at import so every call hands the statement cache the
+# same SQL text
+_SQL_DATA_VERSION = "SELECT MAX(id), COUNT(*) FROM it_tickets"
+
+# Columns in ITTicket constructor order, so rows unpack positionally
+_SQL_SELECT_TICKETS = """SELECT ticket_id, priority, description, status,
+          assigned_to, created_at, resolution_time_hours
+   FROM it_tickets"""
+_SQL_TICKET_BY_ID = _SQL_SELECT_TICKETS + " WHERE ticket_id = ?"
+_SQL_TICKETS_BY_IDS = _SQL_SELECT_TICKETS + " WHERE ticket_id IN ({})"
+# Built once for full batches; only a shorter last batch formats its own text
+_SQL_TICKETS_BY_IDS_FULL = _SQL_TICKETS_BY_IDS.format(",".join("?" * _IDS_PER_QUERY))
+# Keyset-paged lists, as (first page, pages after a given ticket_id). A page
+# is one range scan of the (filter, ticket_id) index, however deep it is.
+# The bound ID takes ticket_id's TEXT affinity, so < compares in the same
+# order as the ORDER BY. A negative LIMIT means no limit in SQLite.
+_SQL_ALL_TICKETS_PAGE = (
+    _SQL_SELECT_TICKETS + " ORDER BY ticket_id DESC LIMIT ?",
+    _SQL_SELECT_TICKETS + " WHERE ticket_id < ? ORDER BY ticket_id DESC LIMIT ?",
+)
+_SQL_TICKETS_BY_STATUS_PAGE = (
+    _SQL_SELECT_TICKETS + " WHERE status = ? ORDER BY ticket_id DESC LIMIT ?",
+    _SQL_SELECT_TICKETS + " WHERE status = ? AND ticket_id < ? ORDER BY ticket_id DESC LIMIT ?",
+)
+_SQL_TICKETS_BY_PRIORITY_PAGE = (
+    _SQL_SELECT_TICKETS + " WHERE priority = ? ORDER BY ticket_id DESC LIMIT ?",
+    _SQL_SELECT_TICKETS + " WHERE priority = ? AND ticket_id < ? ORDER BY ticket_id DESC LIMIT ?",
+)
+_SQL_TICKETS_BY_ASSIGNEE_PAGE = (
+    _SQL_SELECT_TICKETS + " WHERE assigned_to = ? ORDER BY ticket_id DESC LIMIT ?",
+    _SQL_SELECT_TICKETS + " WHERE assigned_to = ? AND ticket_id < ? ORDER BY ticket_id DESC LIMIT ?",
+)
+
+# Insert one ticket, numbering it in the same statement and handing the new
+# ID back (ticket_id is stored as TEXT, so cast before taking the MAX).
+# SQLite stamps created_at itself, local time in the stored rows' layout.
+_SQL_CREATE_TICKET = """INSERT INTO it_tickets 
+   (ticket_id, priority, description, status, assigned_to, created_at)
+   SELECT COALESCE(MAX(CAST(ticket_id AS INTEGER)), 2000) + 1, ?, ?, 'Open', ?,
+          strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+   FROM it_tickets
+   RETURNING CAST(ticket_id AS INTEGER)"""
+_SQL_UPDATE_STATUS = "UPDATE it_tickets SET status = ? WHERE ticket_id = ?"
+# Changes any mix of fields in one statement; a NULL leaves that field as is
+_SQL_UPDATE_TICKET = """UPDATE it_tickets 
+   SET status = COALESCE(?, status), assigned_to = COALESCE(?, assigned_to) 
+   WHERE ticket_id = ?"""
+_SQL_ASSIGN_TICKET = "UPDATE it_tickets SET assigned_to = ? WHERE ticket_id = ?"
+_SQL_DELETE_TICKET = "DELETE FROM it_tickets WHERE ticket_id = ?"
+
+_SQL_RECENT_DF = """SELECT ticket_id, priority, status,
+          substr(description, 1, ?) || '...' AS description,
+          assigned_to, created_at
+   FROM it_tickets ORDER BY ticket_id DESC LIMIT ?"""
+_SQL_DAILY_COUNTS = """SELECT date(created_at) AS date, COUNT(*) AS count
+   FROM it_tickets
+   WHERE date(created_at) IS NOT NULL
+   GROUP BY 1 ORDER BY 1"""
+_SQL_RECENT_SUMMARIES = """SELECT ticket_id, substr(description, 1, ?)
+   FROM it_tickets ORDER BY ticket_id DESC LIMIT ?"""
+
+_SQL_STATUS_PRIORITY_COUNTS = """SELECT status, priority, COUNT(*) as count 
+   FROM it_tickets 
+   GROUP BY status, priority"""
+# Per (status, priority) group: the ticket count plus the sum and count of
+# resolution times
+_SQL_STATISTICS = """SELECT status, priority, COUNT(*) as count, 
+          SUM(resolution_time_hours) as hours, 
+          COUNT(resolution_time_hours) as resolved 
+   FROM it_tickets 
+   GROUP BY status, priority"""
+
+
 class TicketService:
     """Service class for managing IT tickets."""
     
@@ -17,33 +98,112 @@ class TicketService:
         """
         self._db = db
     
-    def get_all_tickets(self) -> List[ITTicket]:
+    def get_data_version(self) -> tuple:
         """
-        Retrieve all IT tickets.
+        Get a cheap stamp that changes when tickets are added or removed,
+        and after any write committed through this app's DatabaseManager.
+        
+        Updates made by other programs leave it unchanged.
         
         Returns:
-            List[ITTicket]: List of all tickets
+            tuple: (highest row id, row count, commit count)
         """
-        rows = self._db.fetch_all(
-            """SELECT ticket_id, priority, description, status, 
-                      assigned_to, created_at, resolution_time_hours
-               FROM it_tickets ORDER BY ticket_id DESC"""
-        )
+        row = self._db.fetch_one(_SQL_DATA_VERSION)
+        return (*row, self._db.get_commit_count())
+    
+    def _query_tickets(self, queries: tuple, params: tuple = (),
+                       limit: Optional[int] = None,
+                       before_id: Optional[int] = None) -> List[TicketView]:
+        """
+        Run a keyset-paged ticket query and wrap the result rows.
+        
+        Unlike OFFSET, which reads and discards every skipped row, the next
+        page starts straight after the last ticket ID the caller has seen,
+        and stays stable while new tickets are added.
         
-        tickets = []
+        Args:
+            queries: One of the *_PAGE (first page, later pages) query pairs
+            params: Filter parameters
+            limit: Maximum number of rows to return, or None for all
+            before_id: Only return tickets older than this ID, i.e. the last
+                ID of the previous page (default: start at the newest)
+            
+        Returns:
+            List[TicketView]: Matching tickets
+        """
+        limit = -1 if limit is None else limit
+        if before_id is None:
+            return self._db.fetch_as(queries[0], (*params, limit), TicketView)
+        return self._db.fetch_as(queries[1], (*params, before_id, limit), TicketView)
+    
+    def get_all_tickets(self, limit: Optional[int] = None,
+                        before_id: Optional[int] = None) -> List[TicketView]:
+        """
+        Retrieve all IT tickets, newest first.
+        
+        Args:
+            limit: Maximum number of tickets to return, or None for all
+            before_id: Last ticket ID of the previous page, for paging
+            
+        Returns:
+            List[TicketView]: List of all tickets
+        """
+        return self._query_tickets(_SQL_ALL_TICKETS_PAGE, (), limit, before_id)
+    
+    def iter_all_tickets(self) -> Iterator[TicketView]:
+        """
+        Iterate over all IT tickets, newest first.
+        
+        Rows are read in batches as the caller iterates, so the whole table
+        is never held in memory at once.
+        
+        Yields:
+            TicketView: One ticket at a time
+        """
+        rows = self._db.fetch_iter(_SQL_ALL_TICKETS_PAGE[0], (-1,))
         for row in rows:
-            ticket = ITTicket(
-                ticket_id=row['ticket_id'],
-                priority=row['priority'],
-                description=row['description'],
-                status=row['status'],
-                assigned_to=row['assigned_to'],
-                created_at=row['created_at'],
-                resolution_time_hours=row['resolution_time_hours']
-            )
-            tickets.append(ticket)
-        
-        return tickets
+            yield TicketView(row)
+    
+    def get_recent_df(self, limit: int = 30, description_length: int = 40) -> pd.DataFrame:
+        """
+        Get the most recent tickets as a DataFrame for table views.
+        
+        substr() shortens each description inside the query, so only the
+        first `description_length` characters reach Python.
+        
+        Args:
+            limit: Maximum number of tickets to return
+            description_length: Characters of each description to keep
+            
+        Returns:
+            pd.DataFrame: Ticket rows, newest first
+        """
+        return self._db.read_dataframe(_SQL_RECENT_DF, (description_length, limit))
+    
+    def get_daily_counts(self) -> pd.DataFrame:
+        """
+        Count tickets created per day, aggregated in SQL.
+        
+        Timestamps SQLite cannot parse as a date are left out.
+        
+        Returns:
+            pd.DataFrame: 'date' and 'count' columns, oldest day first
+        """
+        return self._db.read_dataframe(_SQL_DAILY_COUNTS, parse_dates=['date'])
+    
+    def get_recent_summaries(self, limit: int = 15,
+                             description_length: int = 40) -> List[tuple]:
+        """
+        Get id and shortened description of the most recent tickets.
+        
+        Args:
+            limit: Maximum number of tickets to return
+            description_length: Characters of each description to keep
+            
+        Returns:
+            List[tuple]: (ticket_id, description) rows, newest first
+        """
+        return self._db.fetch_tuples(_SQL_RECENT_SUMMARIES, (description_length, limit))
     
     def get_ticket_by_id(self, ticket_id: int) -> Optional[ITTicket]:
         """
@@ -55,120 +215,93 @@ class TicketService:
         Returns:
             Optional[ITTicket]: Ticket object or None
         """
-        row = self._db.fetch_one(
-            """SELECT ticket_id, priority, description, status,
-                      assigned_to, created_at, resolution_time_hours
-               FROM it_tickets WHERE ticket_id = ?""",
-            (ticket_id,)
-        )
+        row = self._db.fetch_one(_SQL_TICKET_BY_ID, (ticket_id,))
+        return ITTicket(*row) if row else None
+    
+    def get_tickets_by_ids(self, ticket_ids: Sequence[int]) -> List[TicketView]:
+        """
+        Get many tickets by ID with one query per _IDS_PER_QUERY IDs.
+        
+        Args:
+            ticket_ids: IDs of tickets to retrieve
+            
+        Returns:
+            List[TicketView]: Tickets in the order their IDs were given;
+                IDs with no ticket are left out
+        """
+        found = {}
+        for start in range(0, len(ticket_ids), _IDS_PER_QUERY):
+            chunk = ticket_ids[start:start + _IDS_PER_QUERY]
+            if len(chunk) == _IDS_PER_QUERY:
+                sql = _SQL_TICKETS_BY_IDS_FULL
+            else:
+                sql = _SQL_TICKETS_BY_IDS.format(",".join("?" * len(chunk)))
+            for ticket in self._db.fetch_as(sql, chunk, TicketView):
+                found[ticket[0]] = ticket
         
-        if row:
-            return ITTicket(
-                ticket_id=row['ticket_id'],
-                priority=row['priority'],
-                description=row['description'],
-                status=row['status'],
-                assigned_to=row['assigned_to'],
-                created_at=row['created_at'],
-                resolution_time_hours=row['resolution_time_hours']
-            )
-        return None
+        # ticket_id is stored as TEXT, so match on the string form
+        tickets = (found.get(str(ticket_id)) for ticket_id in ticket_ids)
+        return [ticket for ticket in tickets if ticket is not None]
     
-    def get_tickets_by_status(self, status: str) -> List[ITTicket]:
+    def get_tickets_by_status(self, status: str, limit: Optional[int] = None,
+                              before_id: Optional[int] = None) -> List[TicketView]:
         """
-        Get tickets filtered by status.
+        Get tickets filtered by status, newest first.
         
         Args:
             status: Status to filter by
+            limit: Maximum number of tickets to return, or None for all
+            before_id: Last ticket ID of the previous page, for paging
             
         Returns:
-            List[ITTicket]: Filtered tickets
+            List[TicketView]: Filtered tickets
         """
-        rows = self._db.fetch_all(
-            """SELECT ticket_id, priority, description, status,
-                      assigned_to, created_at, resolution_time_hours
-               FROM it_tickets WHERE status = ? ORDER BY ticket_id DESC""",
-            (status,)
-        )
+        return self._query_tickets(_SQL_TICKETS_BY_STATUS_PAGE, (status,), limit, before_id)
+    
+    def iter_tickets_by_status(self, status: str) -> Iterator[TicketView]:
+        """
+        Iterate over tickets with a given status, newest first, reading rows
+        in batches.
         
-        tickets = []
+        Args:
+            status: Status to filter by
+            
+        Yields:
+            TicketView: One ticket at a time
+        """
+        rows = self._db.fetch_iter(_SQL_TICKETS_BY_STATUS_PAGE[0], (status, -1))
         for row in rows:
-            ticket = ITTicket(
-                ticket_id=row['ticket_id'],
-                priority=row['priority'],
-                description=row['description'],
-                status=row['status'],
-                assigned_to=row['assigned_to'],
-                created_at=row['created_at'],
-                resolution_time_hours=row['resolution_time_hours']
-            )
-            tickets.append(ticket)
-        
-        return tickets
+            yield TicketView(row)
     
-    def get_tickets_by_priority(self, priority: str) -> List[ITTicket]:
+    def get_tickets_by_priority(self, priority: str, limit: Optional[int] = None,
+                                before_id: Optional[int] = None) -> List[TicketView]:
         """
-        Get tickets filtered by priority.
+        Get tickets filtered by priority, newest first.
         
         Args:
             priority: Priority level to filter by
+            limit: Maximum number of tickets to return, or None for all
+            before_id: Last ticket ID of the previous page, for paging
             
         Returns:
-            List[ITTicket]: Filtered tickets
+            List[TicketView]: Filtered tickets
         """
-        rows = self._db.fetch_all(
-            """SELECT ticket_id, priority, description, status,
-                      assigned_to, created_at, resolution_time_hours
-               FROM it_tickets WHERE priority = ? ORDER BY ticket_id DESC""",
-            (priority,)
-        )
-        
-        tickets = []
-        for row in rows:
-            ticket = ITTicket(
-                ticket_id=row['ticket_id'],
-                priority=row['priority'],
-                description=row['description'],
-                status=row['status'],
-                assigned_to=row['assigned_to'],
-                created_at=row['created_at'],
-                resolution_time_hours=row['resolution_time_hours']
-            )
-            tickets.append(ticket)
-        
-        return tickets
+        return self._query_tickets(_SQL_TICKETS_BY_PRIORITY_PAGE, (priority,), limit, before_id)
     
-    def get_tickets_by_assignee(self, assigned_to: str) -> List[ITTicket]:
+    def get_tickets_by_assignee(self, assigned_to: str, limit: Optional[int] = None,
+                                before_id: Optional[int] = None) -> List[TicketView]:
         """
-        Get tickets assigned to a specific person.
+        Get tickets assigned to a specific person, newest first.
         
         Args:
             assigned_to: Assignee name
+            limit: Maximum number of tickets to return, or None for all
+            before_id: Last ticket ID of the previous page, for paging
             
         Returns:
-            List[ITTicket]: Filtered tickets
+            List[TicketView]: Filtered tickets
         """
-        rows = self._db.fetch_all(
-            """SELECT ticket_id, priority, description, status,
-                      assigned_to, created_at, resolution_time_hours
-               FROM it_tickets WHERE assigned_to = ? ORDER BY ticket_id DESC""",
-            (assigned_to,)
-        )
-        
-        tickets = []
-        for row in rows:
-            ticket = ITTicket(
-                ticket_id=row['ticket_id'],
-                priority=row['priority'],
-                description=row['description'],
-                status=row['status'],
-                assigned_to=row['assigned_to'],
-                created_at=row['created_at'],
-                resolution_time_hours=row['resolution_time_hours']
-            )
-            tickets.append(ticket)
-        
-        return tickets
+        return self._query_tickets(_SQL_TICKETS_BY_ASSIGNEE_PAGE, (assigned_to,), limit, before_id)
     
     def create_ticket(self, priority: str, description: str,
                      assigned_to: str = None) -> int:
@@ -183,25 +316,11 @@ class TicketService:
         Returns:
             int: ID of newly created ticket
         """
-        from datetime import datetime
-        
-        # Get next ticket ID
-        max_row = self._db.fetch_one(
-            "SELECT MAX(ticket_id) as max_id FROM it_tickets"
+        created = self._db.execute_returning(
+            _SQL_CREATE_TICKET,
+            (priority, description, assigned_to)
         )
-        next_id = (max_row['max_id'] or 2000) + 1
-        
-        created_at = datetime.now().isoformat()
-        
-        # Insert ticket
-        self._db.execute_query(
-            """INSERT INTO it_tickets 
-               (ticket_id, priority, description, status, assigned_to, created_at)
-               VALUES (?, ?, ?, 'Open', ?, ?)""",
-            (next_id, priority, description, assigned_to, created_at)
-        )
-        
-        return next_id
+        return created[0][0]
     
     def update_ticket_status(self, ticket_id: int, new_status: str) -> bool:
         """
@@ -211,15 +330,61 @@ class TicketService:
             ticket_id: ID of ticket to update
             new_status: New status value
             
+        Returns:
+            bool: True if update successful
+        """
+        return self.bulk_update_status([(ticket_id, new_status)]) > 0
+    
+    def bulk_update_status(self, updates: Iterable[tuple]) -> int:
+        """
+        Update the status of many tickets with a single commit.
+        
+        Args:
+            updates: (ticket_id, new_status) tuples
+            
+        Returns:
+            int: Number of tickets updated
+        """
+        cursor = self._db.execute_many(
+            _SQL_UPDATE_STATUS,
+            ((new_status, ticket_id) for ticket_id, new_status in updates)
+        )
+        return cursor.rowcount
+    
+    def update_ticket(self, ticket_id: int, *, status: Optional[str] = None,
+                      assigned_to: Optional[str] = None) -> bool:
+        """
+        Update a ticket's status and/or assignee in one statement.
+        
+        Args:
+            ticket_id: ID of ticket to update
+            status: New status value, or None to keep the current one
+            assigned_to: Person to assign to, or None to keep the current one
+            
         Returns:
             bool: True if update successful
         """
         cursor = self._db.execute_query(
-            "UPDATE it_tickets SET status = ? WHERE ticket_id = ?",
-            (new_status, ticket_id)
+            _SQL_UPDATE_TICKET,
+            (status, assigned_to, ticket_id)
         )
         return cursor.rowcount > 0
     
+    def update_status_and_assignee(self, ticket_id: int, new_status: str,
+                                   assigned_to: Optional[str] = None) -> bool:
+        """
+        Update a ticket's status and, optionally, its assignee in one statement.
+        
+        Args:
+            ticket_id: ID of ticket to update
+            new_status: New status value
+            assigned_to: Person to assign to, or None to keep the current one
+            
+        Returns:
+            bool: True if update successful
+        """
+        return self.update_ticket(ticket_id, status=new_status, assigned_to=assigned_to)
+    
     def assign_ticket(self, ticket_id: int, assigned_to: str) -> bool:
         """
         Assign a ticket to someone.
@@ -231,11 +396,23 @@ class TicketService:
         Returns:
             bool: True if assignment successful
         """
-        cursor = self._db.execute_query(
-            "UPDATE it_tickets SET assigned_to = ? WHERE ticket_id = ?",
-            (assigned_to, ticket_id)
+        return self.bulk_assign([(ticket_id, assigned_to)]) > 0
+    
+    def bulk_assign(self, assignments: Iterable[tuple]) -> int:
+        """
+        Assign many tickets with a single commit.
+        
+        Args:
+            assignments: (ticket_id, assigned_to) tuples
+            
+        Returns:
+            int: Number of tickets assigned
+        """
+        cursor = self._db.execute_many(
+            _SQL_ASSIGN_TICKET,
+            ((assigned_to, ticket_id) for ticket_id, assigned_to in assignments)
         )
-        return cursor.rowcount > 0
+        return cursor.rowcount
     
     def delete_ticket(self, ticket_id: int) -> bool:
         """
@@ -247,11 +424,34 @@ class TicketService:
         Returns:
             bool: True if deletion successful
         """
-        cursor = self._db.execute_query(
-            "DELETE FROM it_tickets WHERE ticket_id = ?",
-            (ticket_id,)
+        return self.bulk_delete([ticket_id]) > 0
+    
+    def bulk_delete(self, ticket_ids: Iterable[int]) -> int:
+        """
+        Delete many tickets with a single commit.
+        
+        Args:
+            ticket_ids: IDs of tickets to delete
+            
+        Returns:
+            int: Number of tickets deleted
+        """
+        cursor = self._db.execute_many(
+            _SQL_DELETE_TICKET,
+            ((ticket_id,) for ticket_id in ticket_ids)
         )
-        return cursor.rowcount > 0
+        return cursor.rowcount
+    
+    def get_status_priority_counts(self) -> dict:
+        """
+        Get count of tickets for each (status, priority) pair.
+        
+        Returns:
+            dict: Counts keyed by (status, priority)
+        """
+        rows = self._db.fetch_tuples(_SQL_STATUS_PRIORITY_COUNTS)
+        
+        return {(status, priority): count for status, priority, count in rows}
     
     def get_ticket_statistics(self) -> dict:
         """
@@ -260,29 +460,24 @@ class TicketService:
         Returns:
             dict: Statistics including counts by status and priority
         """
-        # Count by status
-        status_rows = self._db.fetch_all(
-            """SELECT status, COUNT(*) as count 
-               FROM it_tickets 
-               GROUP BY status"""
-        )
+        # One scan, with the per-group results folded into the totals below
+        rows = self._db.fetch_tuples(_SQL_STATISTICS)
         
-        # Count by priority
-        priority_rows = self._db.fetch_all(
-            """SELECT priority, COUNT(*) as count 
-               FROM it_tickets 
-               GROUP BY priority"""
-        )
+        by_status = {}
+        by_priority = {}
+        total_hours = 0
+        total_resolved = 0
+        for status, priority, count, hours, resolved in rows:
+            by_status[status] = by_status.get(status, 0) + count
+            by_priority[priority] = by_priority.get(priority, 0) + count
+            total_hours += hours or 0
+            total_resolved += resolved
         
-        # Average resolution time
-        avg_row = self._db.fetch_one(
-            """SELECT AVG(resolution_time_hours) as avg_time 
-               FROM it_tickets 
-               WHERE resolution_time_hours IS NOT NULL"""
-        )
+        # Average resolution time, weighted by each group's resolved tickets
+        avg_time = total_hours / total_resolved if total_resolved else 0
         
         return {
-            'by_status': {row['status']: row['count'] for row in status_rows},
-            'by_priority': {row['priority']: row['count'] for row in priority_rows},
-            'avg_resolution_hours': round(avg_row['avg_time'] or 0, 2)
+            'by_status': by_status,
+            'by_priority': by_priority,
+            'avg_resolution_hours': round(avg_time, 2)
         }
\ No newline at end of file